@@ -0,0 +1,153 @@
+"""Measure the memory and the time of the objects made in the hot paths.
+
+python bench.py         every benchmark
+python bench.py slots   the memory and the construction time of the slotted classes
+python bench.py providers   the construction of the frames and the CSMA, with and without resolve_providers
+"""
+
+import gc
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from config import sim_settings
+from constant import ONE_SECOND
+from core.abc.medium import AbstractMedium
+from core.abc.station import AbstractStation
+from core.implements import CSMA, Frame, FrameRadius, FrameStorage
+from core.time.wheel import TimerWheel
+from main import simulate, wire
+from utils.counter import Counter
+
+
+def bytes_per_object(make: Callable[[], object], count: int = 10000) -> float:
+    # the list is made before tracing, so only the objects are counted
+    objects: List[object] = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    for i in range(count):
+        objects[i] = make()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / count
+
+
+def us_per_call(call: Callable[[], object], number: int = 10000) -> float:
+    return min(timeit.repeat(call, number=number, repeat=5)) / number * 1e6
+
+
+def small_medium(settings: Dict) -> Tuple[AbstractMedium, AbstractStation]:
+    # the stations are made, but no tick is run
+    wire({**settings, "max_time": 0})
+    medium = next(iter(simulate().group("medium")))
+    return medium, medium.stations[0]
+
+
+def bench_slots():
+    settings = sim_settings
+    timers = TimerWheel(settings["step"])
+    # shared, the state of a random stream is not a part of the CSMA
+    rng = random.Random(0)
+
+    def make_csma() -> CSMA:
+        return CSMA(
+            data_rate=settings["data_rate"],
+            timers=timers,
+            rng=rng,
+            frame_size=settings["frame_size"],
+            slot_time=settings["slot_time"],
+            sifs_amount=settings["sifs"],
+            backoff_min=settings["backoff_min"],
+            backoff_max=settings["backoff_max"],
+        )
+
+    medium, sender = small_medium(settings)
+    receiver = medium.stations[1]
+
+    def make_frame():
+        return medium.frame_factory(id=0, sender=sender, receiver=receiver, typ="DATA")
+
+    objects = {
+        "Counter": lambda: Counter(timers),
+        "FrameStorage": lambda: FrameStorage(10),
+        "CSMA": make_csma,
+        "FrameRadius": lambda: FrameRadius((0, 0)),
+        "Frame": make_frame,
+    }
+    print("[slots]")
+    for name, make in objects.items():
+        print(
+            f"{name:20} {bytes_per_object(make):7.0f} B/obj",
+            f"{us_per_call(make):7.2f} us/new",
+        )
+    counter = Counter(timers, value=3)
+    print(f"{'Counter.is_left':20} {us_per_call(counter.is_left, 100000) * 1e3:7.0f} ns/call")
+
+    # the headless run of the __slots__ change, fine stepping
+    run = {
+        **settings,
+        "station_count": 30,
+        "frame_rate": 500,
+        "max_time": 300 * ONE_SECOND // 1000,
+        "seed": 1,
+    }
+    wire(run)
+    start = time.perf_counter()
+    simulate()
+    print(
+        f"{'headless run':20} {time.perf_counter() - start:7.2f} s",
+        "(30 stations, 500 fps, 300 ms)",
+    )
+
+
+def bench_providers():
+    settings = sim_settings
+    rng = random.Random(0)
+    print("[providers]")
+    for resolved in (False, True):
+        container = wire({**settings, "max_time": 0, "resolve_providers": resolved})
+        medium = next(iter(simulate().group("medium")))
+        sender, receiver = medium.stations[0], medium.stations[1]
+        # the frames are made by the factory bound at wire time, or by the injected constructor
+        make = medium.frame_factory or Frame
+        csma = container.config.csma()
+
+        def make_frame():
+            return make(id=0, sender=sender, receiver=receiver, typ="DATA")
+
+        def make_csma():
+            return csma(data_rate=settings["data_rate"], timers=sender.timeline.timers, rng=rng)
+
+        name = "resolved" if resolved else "injected"
+        print(f"{name + ' frame':20} {us_per_call(make_frame):7.2f} us/new")
+        print(f"{name + ' CSMA':20} {us_per_call(make_csma):7.2f} us/new")
+
+    # the drawings and the frames join the timeline of their sender instead of registering
+    timeline = sender.timeline
+    participant = FrameRadius((0, 0))
+
+    def register():
+        participant.register()
+        participant.unregister()
+
+    def join():
+        participant.join(timeline)
+        participant.unregister()
+
+    print(f"{'register':20} {us_per_call(register):7.2f} us/call (with unregister)")
+    print(f"{'join':20} {us_per_call(join):7.2f} us/call (with unregister)")
+
+
+benches = {
+    "slots": bench_slots,
+    "providers": bench_providers,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(benches)
+    for name in names:
+        benches[name]()
@@ -1,5 +1,6 @@
 from constant import (
     MEGA,
+    MILLI_SECOND,
     ONE_SECOND,
     SPEED_OF_LIGHT,
 )
@@ -23,6 +24,19 @@ default_settings = {
     "log": True,
     "log_screen": True,
     "sifs": 10,
+    "engine": "step",
+    "fast_forward": False,
+    "max_step": None,
+    "active_set": True,
+    "spatial_index": "matrix",
+    "replicas": 1,
+    "frame_storage": "list",
+    "send_queue_size": 10,
+    "resolve_providers": True,
+    "seed": None,
+    "traffic": "bernoulli",  # or "poisson", "cbr", "on_off"
+    "on_time": 10 * MILLI_SECOND,  # mean on period of the "on_off" traffic
+    "off_time": 10 * MILLI_SECOND,  # mean off period of the "on_off" traffic
 }
 
 station_count = [
@@ -58,6 +72,8 @@ sim_settings = {
     "max_time": 30 * ONE_SECOND // 1000,
     "log": False,
     "log_screen": False,
+    # bit-identical to fine stepping, see ``main.py --check``
+    "engine": "event",
 }
 
 various_settings = []
@@ -70,3 +86,40 @@ various_settings += [
     for f in frame_rate
     for b in backoff_min
 ]
+
+# controls of ``main.py --simulation``, overridden by the options of the same names
+sweep_settings = {
+    "workers": None,  # os.cpu_count()
+    "chunksize": 1,
+    "timeout": None,  # seconds of wall time for a run
+    "retries": 1,
+    "runs": 1,  # runs of every settings
+}
+
+# seeded runs which every stepping mode must reproduce bit by bit, see ``main.py --check``
+regression_seeds = [1, 2, 3]
+regression_settings = [
+    {**sim_settings, "max_time": 50 * ONE_SECOND // 1000, **s}
+    for s in [
+        {"station_count": 5, "frame_rate": 300},
+        {"station_count": 10, "frame_rate": 500, "with_rts": False},
+        {"station_count": 8, "frame_rate": 400, "star_topology": False},
+        {"station_count": 20, "frame_rate": 50, "step": 10},
+        {"station_count": 10, "frame_rate": 300, "replicas": 3},
+        {
+            "station_count": 12,
+            "frame_rate": 400,
+            "star_topology": False,
+            "spatial_index": "grid",
+            "frame_storage": "ring",
+        },
+        {"station_count": 6, "frame_rate": 500, "traffic": "poisson", "replicas": 2},
+        {
+            "station_count": 8,
+            "frame_rate": 300,
+            "traffic": "cbr",
+            "with_rts": False,
+            "resolve_providers": False,
+        },
+    ]
+]
@@ -12,3 +12,5 @@ SIFS = 10
 RTS_FRAME_SIZE = 8 * 20
 CTS_FRAME_SIZE = 8 * 14
 ACK_FRAME_SIZE = 8 * 14
+
+FRAME_TYPES = ("RTS", "CTS", "DATA", "ACK")
@@ -4,6 +4,8 @@ from utils.counter import Counter
 
 
 class AbstractCSMA(ABC):
+    __slots__ = ()
+
     rts_duration: int
     cts_duration: int
     sifs_amount: int
@@ -89,15 +91,30 @@ class AbstractCSMA(ABC):
         pass
 
     @abstractmethod
-    def nav_decrease(self, step: int):
-        """Decrease the NAV counter.
+    def hold(self):
+        """Pause SIFS, DIFS and backoff from the current tick.
 
-        decrease the NAV or allocated counter if there is remaining.
+        They only count on the ticks the station contends with the medium idle,
+        NAV and allocated run on the timer wheel until they expire.
+        """
+        pass
+
+    @abstractmethod
+    def is_expired(self) -> bool:
+        """Check if every counter in the order of ``check_and_decrease`` is expired."""
+        pass
+
+    @abstractmethod
+    def is_steady(self, is_busy: bool) -> bool:
+        """Check if ``check_and_decrease`` would change nothing while the medium stays the same.
+
+        A running counter wakes the station from the timer wheel when it expires,
+        so the station only has to be ticked again when this is False.
 
         Parameters
         ----------
-        step : int
-            The step to decrease the counter.
+        is_busy : bool
+            True if the channel is busy.
         """
         pass
 
@@ -105,14 +122,13 @@ class AbstractCSMA(ABC):
     def check_and_decrease(self, is_busy: bool, step: int):
         """Access control and decrement of the counters.
 
-        If NAV is not expired, return False.
-        Decrement of the NAV counter must be done in the station for every tick. It is separated because this method is not called in every tick.
+        If NAV is not expired, return False and hold the other counters.
 
-        If SIFS or DIFS is not expired, return False and decrease them.
+        If SIFS or DIFS is not expired, return False and run them if the medium is not busy, else pause them.
         If DIFS is just ended, set the backoff counter before the returning.
 
         If backoff is not expired, return False.
-        Before returning, decrease the backoff counter if the medium is not busy.
+        Before returning, run the backoff counter if the medium is not busy.
         If busy, remove the backoff and set DIFS counter. This sets the state of the station to start of the state diagram.
 
         If every counter is expired, return True if the medium is not busy.
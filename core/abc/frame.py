@@ -10,7 +10,9 @@ FrameType = str
 
 
 class AbstractFrame(ABC):
-    id: str
+    __slots__ = ()
+
+    id: int
     typ: FrameType
     sender: "AbstractStation"
     receiver: "AbstractStation"
@@ -37,7 +39,7 @@ class AbstractFrame(ABC):
     def done(self):
         """Done sending
 
-        Set the sent_done time.
+        Set the sent_done time, and let the medium complete the reception windows.
         sent_done - sent would be the transmission delay.
         """
         pass
@@ -118,6 +120,8 @@ class AbstractFrame(ABC):
     ) -> "AbstractFrame":
         """Assemble a new frame
 
+        A vanished frame from the frame pool of the medium is reused if there is one.
+
         Parameters
         ----------
         receiver : AbstractStation
@@ -136,6 +140,32 @@ class AbstractFrame(ABC):
         """
         pass
 
+    @abstractmethod
+    def reset(
+        self,
+        id: int,
+        sender: "AbstractStation",
+        receiver: "AbstractStation",
+        typ: FrameType,
+        duration: Optional[int] = None,
+    ):
+        """Reset the frame to be reused as a new frame
+
+        Parameters
+        ----------
+        id : int
+            The new id of the frame
+        sender : AbstractStation
+            The sender of the frame
+        receiver : AbstractStation
+            The receiver of the frame
+        typ : FrameType
+            The type of the frame
+        duration : Optional[int], optional
+            The duration of the frame, by default None
+        """
+        pass
+
     @abstractmethod
     def is_equal(self, frame: "AbstractFrame") -> bool:
         """Check if the frame is equal to the given frame
@@ -167,6 +197,8 @@ class AbstractFrame(ABC):
 class AbstractFrameStorage(ABC):
     """Queue of frames"""
 
+    __slots__ = ()
+
     frames: List[AbstractFrame] = []
     size: int
 
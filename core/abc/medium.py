@@ -1,19 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, List, Optional, Type
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Type
 
 if TYPE_CHECKING:
+    import numpy as np
     from core.abc.station import AbstractStation
     from core.abc.frame import AbstractFrame
+    from utils.rng import RandomStreams
 
 
 class AbstractMedium(ABC):
     propagation_speed: float
     stations: List["AbstractStation"]
-    frames: List["AbstractFrame"]
+    frames: Dict[int, "AbstractFrame"]
     star_topology: bool
     center: Optional["AbstractStation"]
     station_count: int
     area_size: int
+    distances: "np.ndarray"
+    delays: "np.ndarray"
+    neighbors: List[List["AbstractStation"]]
+    neighbor_delays: List[List[int]]
+    spatial_index: str
+    frame_pool: List["AbstractFrame"]
+    frame_factory: Optional[Callable[..., "AbstractFrame"]]
+    frame_pool_high_water: int
+    streams: "RandomStreams"
 
     @abstractmethod
     def init_stations(
@@ -28,6 +39,12 @@ class AbstractMedium(ABC):
     ):
         """Add initial stations to the medium.
 
+        Stations do not move, so the tables of the stations are built once after adding them.
+        See ``build_tables()``.
+
+        The location of every station is drawn from its own "placement" stream of ``streams``,
+        and the streams are given to the stations for their traffic and backoff.
+
         Parameters
         ----------
         data_rate : float
@@ -47,6 +64,20 @@ class AbstractMedium(ABC):
         """
         pass
 
+    @abstractmethod
+    def build_tables(self):
+        """Build the lookup tables of the stations.
+
+        ``neighbors`` is the list of stations in the detect range of each station,
+        ``neighbor_delays`` is the number of ticks until the head of a frame is heard by each of them.
+
+        With the "matrix" spatial index, ``distances`` is the pairwise distance matrix indexed by station id,
+        and ``delays`` is the matrix of the delays.
+        With the "grid" spatial index, stations are put into a uniform grid with the detect range as the cell size,
+        and only the surrounding 3x3 cells are searched for the neighbors, so the matrices are not built.
+        """
+        pass
+
     @abstractmethod
     def set_center(self, station: "AbstractStation"):
         """Set the station as the center of the medium.
@@ -71,11 +102,68 @@ class AbstractMedium(ABC):
         """
         pass
 
+    @abstractmethod
+    def next_frame_id(self) -> int:
+        """Allocate a new frame id.
+
+        Ids are integers increasing monotonically within the medium, so they never collide.
+
+        Returns
+        -------
+        int
+            The new frame id.
+        """
+        pass
+
+    @abstractmethod
+    def acquire_frame(self) -> Optional["AbstractFrame"]:
+        """Take a recycled frame out of the frame pool.
+
+        Returns
+        -------
+        Optional[AbstractFrame]
+            A vanished frame to be reset by the caller, None if the pool is empty.
+        """
+        pass
+
+    @abstractmethod
+    def release_frame(self, frame: "AbstractFrame"):
+        """Return a vanished frame to the frame pool.
+
+        A frame still referenced by a station (the last sent frame waiting for the ack,
+        a frame in the send or receive queues, or a reception window which is not pruned yet)
+        is held back and retried when other frames vanish,
+        so a recycled frame never shows up with another identity.
+
+        Parameters
+        ----------
+        frame : AbstractFrame
+            The vanished frame.
+        """
+        pass
+
+    @abstractmethod
+    def frame_pool_size(self) -> int:
+        """Get the number of frames in the frame pool.
+
+        ``frame_pool_high_water`` is the largest size the pool has reached.
+
+        Returns
+        -------
+        int
+            The number of frames ready to be reused.
+        """
+        pass
+
     @abstractmethod
     def add_frame(self, frame: "AbstractFrame"):
         """Add a frame to the medium.
 
         Added frame would be considered as on air.
+        Frames on air are kept in a dict keyed by the frame id.
+        The time when the head of the frame reaches every station in the range of the sender is computed here,
+        with the distance from the sender and the propagation speed,
+        and the window is opened in the windows of the transmitter of the station.
 
         Parameters
         ----------
@@ -84,6 +172,21 @@ class AbstractMedium(ABC):
         """
         pass
 
+    @abstractmethod
+    def complete_frame(self, frame: "AbstractFrame"):
+        """Complete the reception windows of the frame which is done sending.
+
+        The time when the tail of the frame leaves every station in the range is computed
+        with the sent_done time of the frame.
+        The frame vanishes on the timer wheel of the timeline, once its tail has moved over the range.
+
+        Parameters
+        ----------
+        frame : AbstractFrame
+            The frame which is done sending.
+        """
+        pass
+
     @abstractmethod
     def remove_frame(self, frame: "AbstractFrame"):
         """Remove the frame from the medium.
@@ -113,6 +216,7 @@ class AbstractMedium(ABC):
         """Get a random receiver station from the medium.
 
         The receiver station would be different from the sender station and be in the range of the sender station.
+        It is chosen with the "receiver" stream of the sender.
 
         Parameters
         ----------
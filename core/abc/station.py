@@ -3,6 +3,7 @@ from typing import Optional, Tuple, Type
 from core.abc.frame import AbstractFrame
 from core.abc.medium import AbstractMedium
 from core.abc.transmitter import AbstractTransmitter
+from core.abc.traffic import AbstractTraffic
 
 
 class AbstractStation(ABC):
@@ -21,6 +22,7 @@ class AbstractStation(ABC):
     sent: int
     timeout: int
     with_rts: bool
+    traffic: AbstractTraffic
 
     @abstractmethod
     def want_to_push(self) -> bool:
@@ -29,7 +31,9 @@ class AbstractStation(ABC):
         Sending frame storage of it's transmitter must be empty,
         allocated counter must be expired.
 
-        Then calculate the probability of new frame with it's frame rate.
+        Then take the arrival of the current tick from it's traffic source,
+        the bernoulli, poisson, cbr or on_off arrivals of the ``traffic`` setting.
+        The arrivals while the station is not ready are dropped.
         """
         pass
 
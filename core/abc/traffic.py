@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class AbstractTraffic(ABC):
+    frame_rate: float
+    step: int
+
+    @abstractmethod
+    def __init__(self, frame_rate: float, step: int, rng: "np.random.Generator"):
+        pass
+
+    @abstractmethod
+    def next_arrival(self, at: int) -> Optional[int]:
+        """Get the time of the first arrival at or after the given time.
+
+        Arrivals are drawn ahead in batches, and aligned to the ticks.
+        The arrivals before the given time are dropped,
+        since the station was not ready to take a new frame at that time.
+
+        Parameters
+        ----------
+        at : int
+            The time to look from.
+
+        Returns
+        -------
+        Optional[int]
+            The time of the arrival, None if no frame would arrive.
+        """
+        pass
+
+    @abstractmethod
+    def arrived(self, at: int) -> bool:
+        """Take the arrival at the given time.
+
+        True if a frame arrives at the time, and the arrival is consumed.
+
+        Parameters
+        ----------
+        at : int
+            The current time.
+        """
+        pass
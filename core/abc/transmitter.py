@@ -1,23 +1,30 @@
+import random
 from abc import ABC, abstractmethod
-from typing import Dict, List, Type, Union
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Type, Union
 
 from core.abc.csma import AbstractCSMA
 from core.abc.frame import AbstractFrame, AbstractFrameStorage, FrameType
+from utils.counter import FrameCounter
+from utils.interval import IntervalSet
 
-
-ProceedRecord = Dict
+if TYPE_CHECKING:
+    from core.time.wheel import TimerWheel
 
 
 class AbstractTransmitter(ABC):
+    __slots__ = ()
+
     station_id: int
     data_rate: int
     send_frames: AbstractFrameStorage
     recv_frames: AbstractFrameStorage
-    detected_frames: AbstractFrameStorage
+    windows: IntervalSet[AbstractFrame]
+    collided: Dict[Tuple[int, int], int]
+    captured: int
 
-    recv: List[ProceedRecord]
+    recv: FrameCounter
     recv_current: int
-    sent: List[ProceedRecord]
+    sent: FrameCounter
     sent_current: int
     collisions: int
 
@@ -36,6 +43,9 @@ class AbstractTransmitter(ABC):
         with_rts: bool,
         frame_storage: Type[AbstractFrameStorage],
         csma: Type[AbstractCSMA],
+        timers: "TimerWheel",
+        rng: Optional[random.Random],
+        on_expire: Optional[Callable[[], None]],
     ):
         pass
 
@@ -43,6 +53,8 @@ class AbstractTransmitter(ABC):
     def add_recv_record(self, frame: AbstractFrame):
         """Record the information of received frame.
 
+        Count, size and airtime are added to the fixed slots of the frame type,
+        so the record does not grow over time.
         bps would be calculated with the total size of received data frame.
 
         Parameters
@@ -56,6 +68,7 @@ class AbstractTransmitter(ABC):
     def add_sent_record(self, frame: AbstractFrame):
         """Record the information of sent frame.
 
+        Count, size and airtime are added to the fixed slots of the frame type.
         collision rate would be calculated with the total count of sent frame.
 
         Parameters
@@ -72,6 +85,7 @@ class AbstractTransmitter(ABC):
 
         Pop the frame from the receiving frame storage, and
         add the frame information to the received record list.
+        If another frame overlapped the frame, the frame is captured, and the captured count is increased.
 
         call the on_data() / on_ack() / on_rts() / on_cts() method according to the frame type.
         """
@@ -82,6 +96,8 @@ class AbstractTransmitter(ABC):
         """Callback function when a frame is received unsuccessfully (most likely due to the collision).
 
         Pop the frame from the receiving frame storage.
+        Every frame whose window overlapped the window of the lost frame is counted in ``collided``,
+        keyed by the pair of the sender id of the lost frame and the sender id of the overlapping one.
         """
         pass
 
@@ -97,34 +113,38 @@ class AbstractTransmitter(ABC):
         pass
 
     @abstractmethod
-    def on_detect(self, frame: AbstractFrame):
-        """Handle the frame detection.
+    def detect(self, at: int):
+        """Detect the frames heard at the given time.
 
-        The medium of the station will calculate the distance between the frame and the station on every tick.
-        If the distance is less than the threshold, the frame will be detected and this method would be called.
+        The medium adds the reception window of every frame in the range to ``windows``,
+        and completes it when the frame is done.
+        Call the ``on_detect()`` method for every window which starts at the time, where the head of the frame arrives.
 
-        Push the frame to the detected frame storage.
-        If the number of detected frames is greater than 1, it means that there is a talkover.
-        Push the frame to the receiving frame storage only when the talkover is not detected.
-
-        If the frame is RTS or CTS, every station in the range should be notified, so push the frame to the receiving frame storage.
-        Else if the frame is DATA or ACK, only the receiver should be notified,
-        so push the frame to the receiving frame storage only if the receiver id of frame is matched with station id of self.
-
-        Detected frames should be initialized before every tick.
+        The windows which ended, and can not overlap the live windows or the window of the receiving frame are dropped here.
 
         Parameters
         ----------
-        frame : AbstractFrame
-            The frame which is detected.
+        at : int
+            The current time.
         """
         pass
 
     @abstractmethod
-    def talkover_detected(self) -> bool:
-        """Check if the talkover is detected.
+    def on_detect(self, frame: AbstractFrame):
+        """Handle the arrival of the head of a frame.
+
+        The frame is only received if the station is neither sending nor receiving,
+        otherwise the medium is only busy for the station.
+        Whether the other frames heard meanwhile spoil it is decided when the reception completes.
+
+        If the frame is RTS or CTS, every station in the range should be notified, so push the frame to the receiving frame storage.
+        Else if the frame is DATA or ACK, only the receiver should be notified,
+        so push the frame to the receiving frame storage only if the receiver id of frame is matched with station id of self.
 
-        If the number of detected frames is greater than 1, it means that there is a talkover.
+        Parameters
+        ----------
+        frame : AbstractFrame
+            The frame whose head arrived.
         """
         pass
 
@@ -132,7 +152,7 @@ class AbstractTransmitter(ABC):
     def is_medium_busy(self) -> bool:
         """Check if the medium is busy.
 
-        If the number of detected frames is greater than 0, it means that the medium is busy.
+        The medium is busy if any window covers the time of the last ``detect()``.
         """
         pass
 
@@ -145,24 +165,35 @@ class AbstractTransmitter(ABC):
     def proceed_recv(self, step: int):
         """Proceed receiving the frame.
 
-        If no frames are detected, it means that the some bytes of the frame are losted (most likely due to the collision).
-        Then call the ``on_receive_failure()`` method.
+        The bits received are the time of the window of the frame, until the end of the tick,
+        which no other window covers, with it's own data rate.
+        Call ``on_receive_success()`` method as soon as all bytes of the frame are received,
+        and ``on_receive_failure()`` method when the tail of the frame leaves before that,
+        because some bytes of the frame are lost (most likely due to the collision).
 
-        Else if the talkover is detected, The transmitter can not proceed the receiving because the frame would be poluted by the talkover.
+        Parameters
+        ----------
+        step : int
+            The number of steps to proceed.
+        """
+        pass
 
-        Else if the id or detected frame is not matched with the frame id in receiving frame storage,
-        ``on_receive_failure()`` method would be called because this means that the transmission of original frame is ended,
-        but the receiver is still wants to receiving the frame.
-        This situation could happened when some bytes of the frame are losted due to the collision,
-        and the one which made the collision is detected after the original transmission is ended.
+    @abstractmethod
+    def recv_decided_at(self, step: int) -> Optional[int]:
+        """Get the tick on which ``proceed_recv()`` succeeds or fails, with the windows heard so far.
 
-        If the frame is correctly detected, proceed the receiving with it's own data rate
-        call ``on_receive_success()`` method if all bytes of frame are received.
+        A window which starts or is closed later may change it,
+        and the station is woken by those.
 
         Parameters
         ----------
         step : int
-            The number of steps to proceed.
+            The step of the timeline.
+
+        Returns
+        -------
+        Optional[int]
+            The time of the tick, None if an open window covers the rest of the frame.
         """
         pass
 
@@ -200,8 +231,8 @@ class AbstractTransmitter(ABC):
     def proceed_send(self, step: int):
         """Proceed sending the frame.
 
-        Add the sent bytes to the sent bytes of currently sending frame with it's own data rate.
-        If the sent bytes of currently sending frame larger than or equals to the size of the frame,
+        The sent bytes of currently sending frame are the ticks since it departed with it's own data rate.
+        On the first tick which sends more than the size of the frame,
         Call ``frame.done()``, add the sent frame to the sent record list,
         reset the sent bytes and pop the frame from the sending frame storage.
 
@@ -217,7 +248,8 @@ class AbstractTransmitter(ABC):
         """Start sending the frame.
 
         If the frame is not ACK, set timeout for ACK.
-        Call ``frame.depart()`` method and ``proceed_send()`` method.
+        Call ``frame.depart()`` method and ``proceed_send()`` method,
+        and set a timer to wake the station on the tick the frame is done.
 
         Parameters
         ----------
@@ -296,6 +328,9 @@ class AbstractTransmitter(ABC):
     def timeout_occured(self, current: int) -> bool:
         """True if the station is not acked and the timeout is expired.
 
+        With the timer wheel of the timeline, the timeout is a timer registered when the frame is sent,
+        cancelled by the ack, and this only checks whether the timer has fired.
+
         Parameters
         ----------
         current : int
@@ -303,6 +338,17 @@ class AbstractTransmitter(ABC):
         """
         pass
 
+    @abstractmethod
+    def timeout_at(self) -> Optional[int]:
+        """Get the earliest time when ``timeout_occured()`` would be true.
+
+        Returns
+        -------
+        Optional[int]
+            The expiry time of the timeout, None if the station is acked.
+        """
+        pass
+
     @abstractmethod
     def okay_to_send(self, step: int) -> bool:
         """Check if the station is okay to send.
@@ -310,6 +356,7 @@ class AbstractTransmitter(ABC):
         The station must be acked,
         the medium must be idle,
         and the result of ``csma.check_and_decrease()`` method must be true.
+        While the station is not acked, the phases of the csma are held.
 
         Parameters
         ----------
@@ -1,20 +1,37 @@
 from dependency_injector import containers, providers
 
 from core.time.line import TimeLine
+from core.time.event import EventTimeLine
 
 
 class DIContainer(containers.DeclarativeContainer):
     config = providers.Configuration()
     settings = config.settings
 
-    timeline = providers.Singleton(
-        TimeLine,
-        notation=config.notation,
-        interval=config.settings.interval,
-        step=config.settings.step,
-        max_time=config.settings.max_time,
-        area_size=config.settings.area_size,
-        log_screen=config.settings.log_screen,
+    timeline = providers.Selector(
+        config.settings.engine,
+        step=providers.Singleton(
+            TimeLine,
+            notation=config.notation,
+            interval=config.settings.interval,
+            step=config.settings.step,
+            max_time=config.settings.max_time,
+            area_size=config.settings.area_size,
+            log_screen=config.settings.log_screen,
+            max_step=config.settings.max_step,
+            fast_forward=config.settings.fast_forward,
+            active_set=config.settings.active_set,
+        ),
+        event=providers.Singleton(
+            EventTimeLine,
+            notation=config.notation,
+            interval=config.settings.interval,
+            step=config.settings.step,
+            max_time=config.settings.max_time,
+            area_size=config.settings.area_size,
+            log_screen=config.settings.log_screen,
+            max_step=config.settings.max_step,
+        ),
     )
     medium = providers.Factory(config.medium)
     station = providers.Factory(config.station)
@@ -22,3 +39,4 @@ class DIContainer(containers.DeclarativeContainer):
     frame_storage = providers.Factory(config.frame_storage)
     transmitter = providers.Factory(config.transmitter)
     csma = providers.Factory(config.csma)
+    traffic = providers.Factory(config.traffic)
@@ -1,5 +1,20 @@
-from .frame import Frame, FrameRadius, FrameStorage, FramePath, FrameRadiusEdge
+from .frame import (
+    Frame,
+    FrameRadius,
+    FrameStorage,
+    RingFrameStorage,
+    FramePath,
+    FrameRadiusEdge,
+    frame_factory,
+)
 from .station import Station
 from .medium import Medium
 from .transmitter import Transmitter
 from .csma import CSMA
+from .traffic import (
+    Traffic,
+    BernoulliTraffic,
+    PoissonTraffic,
+    CBRTraffic,
+    OnOffTraffic,
+)
@@ -1,4 +1,6 @@
 import random
+from typing import Callable, Optional, TYPE_CHECKING
+
 from dependency_injector.wiring import Provide
 from core.abc.csma import AbstractCSMA
 from core.abc.frame import AbstractFrame
@@ -8,11 +10,35 @@ from constant import (
 )
 from utils.counter import Counter
 
+if TYPE_CHECKING:
+    from core.time.wheel import TimerWheel
+
 
 class CSMA(AbstractCSMA):
+    __slots__ = (
+        "sifs_amount",
+        "difs_amount",
+        "frame_time",
+        "rts_duration",
+        "cts_duration",
+        "backoff_min",
+        "backoff_max",
+        "backoff_range",
+        "backoff",
+        "nav",
+        "allocated",
+        "sifs",
+        "difs",
+        "timers",
+        "rng",
+    )
+
     def __init__(
         self,
         data_rate: int,
+        timers: "TimerWheel",
+        rng: Optional[random.Random] = None,
+        on_expire: Optional[Callable[[], None]] = None,
         frame_size: int = Provide[DIContainer.settings.frame_size],
         slot_time: int = Provide[DIContainer.settings.slot_time],
         sifs_amount: int = Provide[DIContainer.settings.sifs],
@@ -28,11 +54,14 @@ class CSMA(AbstractCSMA):
         self.backoff_min = backoff_min
         self.backoff_max = backoff_max
         self.backoff_range = backoff_min
-        self.backoff = Counter(slot_time)
-        self.nav = Counter()
-        self.allocated = Counter()
-        self.sifs = Counter()
-        self.difs = Counter()
+        self.timers = timers
+        self.rng = rng if rng is not None else random.Random()
+        # every counter expires on the timer wheel, which wakes the station
+        self.backoff = Counter(timers, slot_time, on_expire=on_expire)
+        self.nav = Counter(timers, on_expire=on_expire)
+        self.allocated = Counter(timers, on_expire=on_expire)
+        self.sifs = Counter(timers, on_expire=on_expire)
+        self.difs = Counter(timers, on_expire=on_expire)
 
     def collision_occured(self):
         self.backoff_range = min(self.backoff_range * 2, self.backoff_max)
@@ -41,7 +70,7 @@ class CSMA(AbstractCSMA):
         self.backoff_range = self.backoff_min
 
     def set_backoff(self):
-        self.backoff.reset(random.randint(0, self.backoff_range - 1))
+        self.backoff.reset(self.rng.randint(0, self.backoff_range - 1))
 
     def set_sifs(self):
         self.sifs.reset(self.sifs_amount)
@@ -50,51 +79,80 @@ class CSMA(AbstractCSMA):
         self.difs.reset(self.difs_amount)
 
     def set_nav(self, duration: int):
+        # nav and allocated always run, from the next tick
         self.nav.reset(duration)
+        self.nav.run(self.timers.now)
 
     def set_allocated(self, duration: int):
         self.allocated.reset(duration)
+        self.allocated.run(self.timers.now)
 
     def is_difs(self, with_rts: bool, frame: AbstractFrame):
         return (with_rts and frame.typ == "RTS") or (
             (not with_rts) and frame.typ == "DATA"
         )
 
-    def nav_decrease(self, step: int):
-        # decrease allocated time
-        if self.allocated.is_left():
-            self.allocated.decrease(step)
+    def hold(self):
+        for counter in (self.sifs, self.difs, self.backoff):
+            if counter.running:
+                counter.pause(self.timers.now)
+
+    def is_expired(self) -> bool:
+        return not (
+            self.nav.is_left()
+            or self.sifs.is_left()
+            or self.difs.is_left()
+            or self.backoff.is_left()
+        )
 
-        # nav
+    def is_steady(self, is_busy: bool) -> bool:
+        phases = (self.sifs, self.difs, self.backoff)
         if self.nav.is_left():
-            self.nav.decrease(step)
+            return not any(counter.running for counter in phases)
+        for counter in phases:
+            if counter.is_left():
+                # a busy medium pauses the counting phase, and restarts the backoff
+                if is_busy:
+                    return not counter.running and counter is not self.backoff
+                return counter.running
+        # the expired backoff is drawn again on a busy medium
+        return not is_busy
+
+    def count(self, counter: Counter, is_busy: bool, step: int):
+        # the counter runs on this tick only if the medium is idle
+        if is_busy:
+            counter.pause(self.timers.now)
+        else:
+            counter.run(self.timers.now - step)
 
     def check_and_decrease(self, is_busy: bool, step: int):
         # should hibernate
         if self.nav.is_left():
+            self.hold()
             return False
 
+        # what was left before this tick
+        before = self.timers.now - step
+
         # wait for difs and sifs
-        if self.sifs.is_left():
-            if not is_busy:
-                self.sifs.decrease(step)
+        if self.sifs.remaining(before) > 0:
+            self.count(self.sifs, is_busy, step)
             return False
 
-        if self.difs.is_left():
-            if not is_busy:
-                self.difs.decrease(step)
+        if self.difs.remaining(before) > 0:
+            self.count(self.difs, is_busy, step)
             # difs just ended, set random backoff
             if not self.difs.is_left():
                 self.set_backoff()
             return False
 
         # wait for backoff
-        if self.backoff.is_left():
+        if self.backoff.remaining(before) > 0:
             if is_busy:
                 self.set_difs()
                 self.backoff.reset(0)
             else:
-                self.backoff.decrease(step)
+                self.backoff.run(before)
             return False
 
         # check the medium then set backoff
@@ -1,5 +1,4 @@
-import random
-from typing import List, Tuple, Optional
+from typing import Callable, List, Optional, Sequence, Tuple
 
 from dependency_injector.wiring import Provide
 from constant import ACK_FRAME_SIZE, CTS_FRAME_SIZE, RTS_FRAME_SIZE
@@ -11,33 +10,59 @@ from utils.helper import get_circle, get_distance, get_line
 
 
 class FramePath(TimeParticipant):
+    __slots__ = ("location", "timeline")
+
+    kind = "drawing"
+
     def __init__(self, location: Tuple[float, float]):
         self.location = location
 
+    def next_event_time(self) -> Optional[int]:
+        return None
+
 
 class FrameRadius(TimeParticipant):
+    __slots__ = ("location", "timeline")
+
+    kind = "drawing"
+
     def __init__(self, location: Tuple[float, float]):
         self.location = location
 
+    def next_event_time(self) -> Optional[int]:
+        return None
+
 
 class FrameRadiusEdge(TimeParticipant):
+    __slots__ = ("location", "timeline")
+
+    kind = "drawing"
+
     def __init__(self, location: Tuple[float, float]):
         self.location = location
 
+    def next_event_time(self) -> Optional[int]:
+        return None
+
 
 class DrawRadiusMixin:
-    radius: List[FrameRadius] = []
-    paths: List[FramePath] = []
+    __slots__ = ()
+
+    radius: Sequence[FrameRadius]
+    paths: Sequence[FramePath]
 
     def delete_radius(self):
         for radius in self.radius:
             radius.unregister()
         for path in self.paths:
             path.unregister()
-        self.radius = []
-        self.paths = []
+        # empty tuples are shared, lists are only made while drawing
+        self.radius = ()
+        self.paths = ()
 
     def draw_radius(self):
+        self.radius = []
+        self.paths = []
         radius = int(get_distance(self.location, self.sender.location))
         radius_tail = int(get_distance(self.location_tail, self.sender.location))
         for i in range(radius_tail, radius):
@@ -45,37 +70,63 @@ class DrawRadiusMixin:
                 path = (
                     FrameRadius(point) if i != (radius - 1) else FrameRadiusEdge(point)
                 )
-                path.register()
+                path.join(self.timeline)
                 self.radius.append(path)
 
         paths = get_line(self.location_tail, self.location)
         for point in paths:
             path = FramePath(point)
-            path.register()
+            path.join(self.timeline)
             self.paths.append(path)
 
 
 class Frame(AbstractFrame, DrawRadiusMixin, TimeParticipant):
-    typ = "DATA"
-    sent = None
-    sent_done = None
-    vanished = None
+    __slots__ = (
+        "id",
+        "sender",
+        "receiver",
+        "typ",
+        "size",
+        "data_size",
+        "duration",
+        "propagation_speed",
+        "max_range",
+        "sent",
+        "sent_done",
+        "vanished",
+        "radius",
+        "paths",
+        "timeline",
+    )
+
+    kind = "frame"
 
     def __init__(
         self,
-        id: str,
+        id: int,
         sender: AbstractStation,
         receiver: AbstractStation,
         typ: FrameType,
         size: int = Provide[DIContainer.settings.frame_size],
         duration: Optional[int] = None,
+    ):
+        self.data_size = size
+        self.reset(id, sender, receiver, typ, duration)
+
+    def reset(
+        self,
+        id: int,
+        sender: AbstractStation,
+        receiver: AbstractStation,
+        typ: FrameType,
+        duration: Optional[int] = None,
     ):
         self.id = id
         self.sender = sender
         self.receiver = receiver
         self.typ = typ
 
-        self.size = size
+        self.size = self.data_size
         if self.typ == "RTS":
             self.size = RTS_FRAME_SIZE
         elif self.typ == "CTS":
@@ -86,17 +137,23 @@ class Frame(AbstractFrame, DrawRadiusMixin, TimeParticipant):
         self.duration = duration
         self.propagation_speed = sender.medium.propagation_speed
         self.max_range = sender.detect_range
+        self.sent = None
+        self.sent_done = None
+        self.vanished = None
+        self.radius = ()
+        self.paths = ()
 
     def is_equal(self, frame: AbstractFrame) -> bool:
         return frame.id == self.id
 
     def depart(self):
-        self.register()
-        self.sender.medium.add_frame(self)
+        self.join(self.sender.timeline)
         self.sent = self.timeline.current
+        self.sender.medium.add_frame(self)
 
     def done(self):
         self.sent_done = self.timeline.current
+        self.sender.medium.complete_frame(self)
 
     def vanish(self):
         self.vanished = self.timeline.current
@@ -158,13 +215,32 @@ class Frame(AbstractFrame, DrawRadiusMixin, TimeParticipant):
         typ: FrameType = "DATA",
         duration: Optional[int] = None,
     ) -> "Frame":
-        return Frame(
-            id=str(random.randint(0, 1000000)),
+        medium = sender.medium
+        frame = medium.acquire_frame()
+        if frame is None and medium.frame_factory is not None:
+            return medium.frame_factory(
+                id=medium.next_frame_id(),
+                receiver=receiver,
+                sender=sender,
+                typ=typ,
+                duration=duration,
+            )
+        if frame is None:
+            return Frame(
+                id=medium.next_frame_id(),
+                receiver=receiver,
+                sender=sender,
+                typ=typ,
+                duration=duration,
+            )
+        frame.reset(
+            id=medium.next_frame_id(),
             receiver=receiver,
             sender=sender,
             typ=typ,
             duration=duration,
         )
+        return frame
 
     def __str__(self) -> str:
         return f"{self.typ} {self.sender.id} -> {self.receiver.id}"
@@ -172,15 +248,44 @@ class Frame(AbstractFrame, DrawRadiusMixin, TimeParticipant):
     def icon(self) -> str:
         return f"█{self.typ[0]}"
 
+    def next_event_time(self) -> Optional[int]:
+        if not self.timeline.log_screen:
+            return None
+        return super().next_event_time()
+
     def on_tick(self, step: int):
-        if not self.sent:
+        # the radius is only for the screen, detection does not depend on it
+        if not self.sent or not self.timeline.log_screen:
             return
 
         self.delete_radius()
         self.draw_radius()
 
 
+def frame_factory(size: int) -> Callable[..., Frame]:
+    """Bind the frame size once, the frames are made without the injection.
+
+    See ``main.wire()``.
+    """
+
+    def factory(
+        id: int,
+        sender: AbstractStation,
+        receiver: AbstractStation,
+        typ: FrameType,
+        duration: Optional[int] = None,
+    ) -> Frame:
+        frame = Frame.__new__(Frame)
+        frame.data_size = size
+        frame.reset(id, sender, receiver, typ, duration)
+        return frame
+
+    return factory
+
+
 class FrameStorage(AbstractFrameStorage):
+    __slots__ = ("frames", "size")
+
     def __init__(self, size: int = None):
         self.frames: List[Frame] = []
         self.size = size
@@ -218,3 +323,65 @@ class FrameStorage(AbstractFrameStorage):
             return self.frames.pop(0)
         except IndexError:
             return None
+
+
+class RingFrameStorage(AbstractFrameStorage):
+    __slots__ = ("buffer", "head", "length", "size")
+
+    def __init__(self, size: int = None):
+        self.size = size
+        self.buffer: List[Optional[Frame]] = [None] * (size if size else 4)
+        self.head = 0
+        self.length = 0
+
+    @property
+    def frames(self) -> List[Frame]:
+        return self.all()
+
+    def is_empty(self) -> bool:
+        return self.length == 0
+
+    def is_full(self) -> bool:
+        return self.size is not None and self.length == self.size
+
+    def count(self) -> int:
+        return self.length
+
+    def all(self) -> List[Frame]:
+        capacity = len(self.buffer)
+        return [self.buffer[(self.head + i) % capacity] for i in range(self.length)]
+
+    def clear(self):
+        # in place, only drop the references to the stored frames
+        capacity = len(self.buffer)
+        for i in range(self.length):
+            self.buffer[(self.head + i) % capacity] = None
+        self.head = 0
+        self.length = 0
+
+    def get(self):
+        if self.length == 0:
+            return None
+        return self.buffer[self.head]
+
+    def grow(self):
+        self.buffer = self.all() + [None] * len(self.buffer)
+        self.head = 0
+
+    def push(self, frame):
+        if self.is_full():
+            return
+        if self.length == len(self.buffer):
+            # only unbounded storages grow
+            self.grow()
+        self.buffer[(self.head + self.length) % len(self.buffer)] = frame
+        self.length += 1
+
+    def pop(self):
+        if self.length == 0:
+            return None
+        frame = self.buffer[self.head]
+        self.buffer[self.head] = None
+        self.head = (self.head + 1) % len(self.buffer)
+        self.length -= 1
+        return frame
@@ -1,5 +1,8 @@
-import random
-from typing import List, Type
+import math
+from functools import partial
+from typing import Callable, Dict, List, Optional, Type
+
+import numpy as np
 
 from dependency_injector.wiring import Provide
 from core.abc.medium import AbstractMedium
@@ -8,24 +11,43 @@ from core.abc.frame import AbstractFrame
 from core.container import DIContainer
 
 from core.time.participant import TimeParticipant
-from utils.helper import get_distance, get_random_location, is_location_equal
+from utils.grid import SpatialGrid
+from utils.helper import get_distance, get_random_location
+from utils.rng import RandomStreams
 
 
 class Medium(AbstractMedium, TimeParticipant):
+    kind = "medium"
+
     def __init__(
         self,
         star_topology: bool,
         propagation_speed: float,
         station_count: int,
         area_size: int,
+        spatial_index: str = "matrix",
+        frame_factory: Optional[Callable[..., AbstractFrame]] = None,
+        streams: Optional[RandomStreams] = None,
     ):
         self.propagation_speed = propagation_speed
         self.stations: List[AbstractStation] = []
-        self.frames: List[AbstractFrame] = []
+        self.frames: Dict[int, AbstractFrame] = {}
+        self.last_frame_id = 0
+        self.frame_pool: List[AbstractFrame] = []
+        self.frame_pool_high_water = 0
+        self.retired_frames: List[AbstractFrame] = []
+        self.distances = np.zeros((0, 0))
+        self.delays = np.zeros((0, 0), dtype=int)
+        self.neighbors: List[List[AbstractStation]] = []
+        self.neighbor_delays: List[List[int]] = []
+        self.spatial_index = spatial_index
+        self.grid: Optional[SpatialGrid[AbstractStation]] = None
         self.star_topology = star_topology
         self.area_size = area_size
         self.station_count = station_count
         self.center = None
+        self.frame_factory = frame_factory
+        self.streams = streams if streams is not None else RandomStreams()
         self.register()
 
     def init_stations(
@@ -40,9 +62,12 @@ class Medium(AbstractMedium, TimeParticipant):
         for i in range(0, self.station_count):
             center = self.star_topology and i == 0
 
-            location = get_random_location(self.area_size)
+            placement = self.streams.stream("placement", i)
+            location = get_random_location(self.area_size, rng=placement)
             if self.star_topology and not center:
-                location = get_random_location(self.area_size, detect_range - 1)
+                location = get_random_location(
+                    self.area_size, detect_range - 1, rng=placement
+                )
             elif self.star_topology and center:
                 location = (self.area_size // 2, self.area_size // 2)
 
@@ -55,25 +80,174 @@ class Medium(AbstractMedium, TimeParticipant):
                 detect_range=detect_range,
                 slot_time=slot_time,
                 with_rts=with_rts,
+                streams=self.streams,
             )
 
             if center:
                 self.set_center(station)
 
+        self.build_tables()
+
+    def build_tables(self):
+        if self.spatial_index == "grid":
+            self.build_grid()
+        else:
+            self.build_matrix()
+
+    def build_matrix(self):
+        locations = np.array([station.location for station in self.stations], float)
+        offsets = locations[:, np.newaxis, :] - locations[np.newaxis, :, :]
+        self.distances = np.sqrt((offsets**2).sum(axis=-1))
+        # first tick at which the head of a frame is heard, counted from departure
+        self.delays = (
+            np.floor(self.distances / (self.propagation_speed * self.timeline.step))
+            + 1
+        ).astype(int)
+        self.neighbors = [
+            [
+                other
+                for other in self.stations
+                if other.id != station.id
+                and self.distances[station.id, other.id] < station.detect_range
+            ]
+            for station in self.stations
+        ]
+        self.neighbor_delays = [
+            [int(self.delays[station.id, other.id]) for other in neighbors]
+            for station, neighbors in zip(self.stations, self.neighbors)
+        ]
+
+    def build_grid(self):
+        self.grid = SpatialGrid(max(station.detect_range for station in self.stations))
+        for station in self.stations:
+            self.grid.add(station, station.location)
+
+        self.neighbors = []
+        self.neighbor_delays = []
+        for station in self.stations:
+            neighbors = []
+            delays = []
+            # keep the id order of the dense tables
+            for other in sorted(
+                self.grid.nearby(station.location), key=lambda other: other.id
+            ):
+                distance = get_distance(station.location, other.location)
+                if other.id != station.id and distance < station.detect_range:
+                    neighbors.append(other)
+                    delays.append(
+                        math.floor(
+                            distance / (self.propagation_speed * self.timeline.step)
+                        )
+                        + 1
+                    )
+            self.neighbors.append(neighbors)
+            self.neighbor_delays.append(delays)
+
     def set_center(self, station: AbstractStation):
         self.center = station
 
     def add_station(self, station: AbstractStation):
         self.stations.append(station)
 
+    def next_frame_id(self) -> int:
+        self.last_frame_id += 1
+        return self.last_frame_id
+
+    def acquire_frame(self) -> Optional[AbstractFrame]:
+        if not self.frame_pool:
+            return None
+        return self.frame_pool.pop()
+
+    def frame_in_use(self, frame: AbstractFrame) -> bool:
+        transmitter = frame.sender.transmitter
+        if transmitter.last_sent is frame or frame in transmitter.send_frames.all():
+            return True
+        # only the stations in the range could have heard the frame,
+        # and kept it since their last tick, however many ticks they skipped
+        last_tick = self.current - self.timeline.step
+        for station in self.neighbors[frame.sender.id]:
+            receiving = station.transmitter.recv_frames.get()
+            if station.transmitter.windows.is_kept(
+                frame.id, last_tick, receiving.id if receiving is not None else None
+            ) or frame in station.transmitter.recv_frames.all():
+                return True
+        return False
+
+    def release_frame(self, frame: AbstractFrame):
+        if self.frame_in_use(frame):
+            self.retired_frames.append(frame)
+            return
+        self.frame_pool.append(frame)
+        self.frame_pool_high_water = max(
+            self.frame_pool_high_water, len(self.frame_pool)
+        )
+
+    def frame_pool_size(self) -> int:
+        return len(self.frame_pool)
+
     def add_frame(self, frame: AbstractFrame):
-        self.frames.append(frame)
+        self.frames[frame.id] = frame
+        step = self.timeline.step
+        active_set = self.timeline.active_set
+        # the tail is not known until the frame is done
+        for station, delay in zip(
+            self.neighbors[frame.sender.id], self.neighbor_delays[frame.sender.id]
+        ):
+            start = frame.sent + delay * step
+            station.transmitter.windows.add(frame.id, start, frame)
+            if active_set:
+                # a busy medium is not idle for the station
+                self.timeline.wake_by(station, start)
+
+    def complete_frame(self, frame: AbstractFrame):
+        step = self.timeline.step
+        active_set = self.timeline.active_set
+        # the tail is heard one step after the last bit is sent
+        duration = frame.sent_done + step - frame.sent
+        for station, delay in zip(
+            self.neighbors[frame.sender.id], self.neighbor_delays[frame.sender.id]
+        ):
+            end = frame.sent + delay * step + duration
+            station.transmitter.windows.close(frame.id, end)
+            if active_set:
+                # the end decides the reception and the idle medium from the tick before it
+                self.timeline.wake_by(station, end - step)
+        self.timeline.timers.add(self.vanish_time(frame), partial(self.vanish, frame))
+
+    def vanish_time(self, frame: AbstractFrame) -> int:
+        # the first tick on which the tail has moved over the range, see ``Frame.moved_tail``
+        step = self.timeline.step
+        speed = frame.propagation_speed
+        at = frame.sent_done + step * (2 + int(frame.max_range / (speed * step)))
+        while at - step > frame.sent_done and (
+            at - 2 * step - frame.sent_done
+        ) * speed >= frame.max_range:
+            at -= step
+        while (at - step - frame.sent_done) * speed < frame.max_range:
+            at += step
+        return at
+
+    def vanish(self, frame: AbstractFrame):
+        # the frames kept by a station are released once another frame is gone
+        retired, self.retired_frames = self.retired_frames, []
+        for retired_frame in retired:
+            self.release_frame(retired_frame)
+
+        frame.vanish()
+        # still heard in this tick, like the frames on air
+        for station in self.neighbors[frame.sender.id]:
+            if station.transmitter.windows.cut(
+                frame.id, self.current + self.timeline.step
+            ):
+                self.timeline.due(station)
+        self.remove_frame(frame)
+        self.release_frame(frame)
 
     def remove_frame(self, frame: AbstractFrame):
-        self.frames.remove(frame)
+        self.frames.pop(frame.id, None)
 
     def frame_count(self) -> int:
-        return len(set([f.id for f in self.frames]))
+        return len(self.frames)
 
     def get_random_receiver(self, sender: AbstractStation) -> AbstractStation:
         if self.star_topology:
@@ -81,34 +255,11 @@ class Medium(AbstractMedium, TimeParticipant):
                 return None
             return self.center
 
-        stations = [
-            station
-            for station in self.stations
-            if sender.id != station.id
-            and get_distance(station.location, sender.location) < sender.detect_range
-        ]
+        stations = self.neighbors[sender.id]
         if len(stations) == 0:
             return None
-        return random.choice(stations)
-
-    def on_tick_init(self, step: int):
-        for station in self.stations:
-            station.transmitter.detected_frames.clear()
-
-        for frame in self.frames:
-            if not frame.sent:
-                return
-
-            for station in self.stations:
-                if station.id == frame.sender.id:
-                    continue
-
-                for radius in frame.radius:
-                    if is_location_equal(radius.location, station.location):
-                        station.transmitter.on_detect(frame)
-                        break
-
-            if frame.moved_tail >= frame.max_range and not frame.vanished:
-                frame.vanish()
+        return self.streams.stream("receiver", sender.id).choice(stations)
 
-        self.frames = [f for f in self.frames if not f.vanished]
+    def next_event_time(self) -> Optional[int]:
+        # the frames vanish on the timer wheel
+        return None
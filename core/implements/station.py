@@ -1,5 +1,5 @@
-import random
-from typing import Tuple, Type
+import math
+from typing import Optional, Tuple, Type
 
 from dependency_injector.wiring import Provide, inject
 
@@ -8,14 +8,14 @@ from core.abc.station import AbstractStation
 from core.abc.transmitter import AbstractTransmitter
 from core.abc.csma import AbstractCSMA
 from core.abc.medium import AbstractMedium
+from core.abc.traffic import AbstractTraffic
 from core.time.participant import TimeParticipant
 from core.container import DIContainer
-from constant import (
-    ONE_SECOND,
-)
+from utils.rng import RandomStreams
 
 
 class Station(AbstractStation, TimeParticipant):
+    kind = "station"
     send_queue_size: int = 10
     recv_queue_size: int = 1
     frame: Type[AbstractFrame]
@@ -33,10 +33,13 @@ class Station(AbstractStation, TimeParticipant):
         detect_range: float,
         slot_time: int,
         with_rts: bool,
+        streams: Optional[RandomStreams] = None,
+        send_queue_size: int = Provide[DIContainer.settings.send_queue_size],
         transmitter: Type[AbstractTransmitter] = Provide[DIContainer.transmitter],
         frame: Type[AbstractFrame] = Provide[DIContainer.frame],
         frame_storage: Type[AbstractFrameStorage] = Provide[DIContainer.frame_storage],
         csma: Type[AbstractCSMA] = Provide[DIContainer.csma],
+        traffic: Type[AbstractTraffic] = Provide[DIContainer.traffic],
     ):
         self.id = id
         self.location = location
@@ -46,8 +49,18 @@ class Station(AbstractStation, TimeParticipant):
         self.frame_rate = frame_rate
         self.detect_range = detect_range
         self.slot_time = slot_time
+        self.send_queue_size = send_queue_size
 
         self.frame = frame
+        if streams is None:
+            streams = RandomStreams()
+        # registered first, the timers of the transmitter belong to the timeline
+        self.register()
+        self.traffic = traffic(
+            frame_rate=self.frame_rate,
+            step=self.timeline.step,
+            rng=streams.generator("traffic", self.id),
+        )
         self.transmitter = transmitter(
             station_id=self.id,
             data_rate=self.data_rate,
@@ -56,8 +69,10 @@ class Station(AbstractStation, TimeParticipant):
             with_rts=self.with_rts,
             frame_storage=frame_storage,
             csma=csma,
+            timers=self.timeline.timers,
+            rng=streams.stream("backoff", self.id),
+            on_expire=self.on_timer,
         )
-        self.register()
         self.medium.add_station(self)
 
     def want_to_push(self) -> bool:
@@ -67,7 +82,8 @@ class Station(AbstractStation, TimeParticipant):
         if self.transmitter.csma.allocated.is_left():
             return False
 
-        return random.random() < (self.timeline.step * self.frame_rate / ONE_SECOND)
+        # the arrivals while the station was not ready are dropped
+        return self.traffic.arrived(self.timeline.current)
 
     def choose_receiver(self):
         return self.medium.get_random_receiver(self)
@@ -79,17 +95,75 @@ class Station(AbstractStation, TimeParticipant):
             and (self.timeline.current % self.slot_time == 0)
         )
 
+    def next_slot(self) -> int:
+        # the first tick after the current one which is on a slot boundary
+        period = math.lcm(self.timeline.step, self.slot_time)
+        at = self.timeline.current + self.timeline.step
+        return -(-at // period) * period
+
+    def next_event_time(self) -> Optional[int]:
+        transmitter = self.transmitter
+        current = self.timeline.current
+        step = self.timeline.step
+
+        wakeups = []
+        arrival = transmitter.windows.next_start(current)
+        if arrival is not None:
+            wakeups.append(arrival)
+        # the timeout, nav, allocated, the running phases and the end of the sent frame
+        # wake the station from the timer wheel
+        if transmitter.is_sending():
+            pass
+        elif transmitter.is_receiving():
+            decided = transmitter.recv_decided_at(step)
+            if decided is not None:
+                wakeups.append(decided)
+        elif transmitter.is_acked():
+            csma = transmitter.csma
+            is_busy = transmitter.is_medium_busy()
+            if not csma.is_steady(is_busy):
+                wakeups.append(current + step)
+            elif is_busy:
+                # an open window wakes the station when it is closed
+                idle = transmitter.windows.next_idle(current)
+                if idle is not None:
+                    wakeups.append(idle)
+            elif csma.is_expired() and not transmitter.send_frames.is_empty():
+                wakeups.append(self.next_slot())
+
+        if transmitter.send_frames.is_empty() and not transmitter.csma.allocated.is_left():
+            arrival = self.traffic.next_arrival(current + step)
+            if arrival is not None:
+                wakeups.append(arrival)
+
+        return min(wakeups) if wakeups else None
+
+    def on_timer(self):
+        self.timeline.due(self)
+
     def on_tick(self, step):
+        # the frames heard in this tick, the skipped ones changed nothing
+        self.transmitter.detect(self.timeline.current)
+        # the counters run on the clock, the skipped ticks are already counted
+        self.proceed(self.timeline.step)
+        self.reschedule()
+
+    def reschedule(self):
+        # the event engine always ticks only the woken stations
+        if self.timeline.active_set:
+            self.timeline.wake(self, self.next_event_time())
+
+    def proceed(self, step):
         if self.transmitter.timeout_occured(self.timeline.current):
             self.transmitter.on_timeout()
 
-        self.transmitter.csma.nav_decrease(step)
-
         if self.transmitter.is_sending():
+            self.transmitter.csma.hold()
             self.transmitter.proceed_send(step)
             return
 
         if self.transmitter.is_receiving():
+            self.transmitter.csma.hold()
             self.transmitter.proceed_recv(step)
             return
 
@@ -0,0 +1,137 @@
+import bisect
+import math
+from abc import abstractmethod
+from typing import List, Optional
+
+import numpy as np
+
+from constant import ONE_SECOND
+from core.abc.traffic import AbstractTraffic
+
+
+class Traffic(AbstractTraffic):
+    """Arrivals of a station, drawn ahead by the batch of gaps and aligned up to the ticks."""
+
+    batch = 256
+
+    def __init__(self, frame_rate: float, step: int, rng: np.random.Generator):
+        self.frame_rate = frame_rate
+        self.step = step
+        self.rng = rng
+        # the unaligned time of the last drawn arrival
+        self.last = 0.0
+        self.arrivals: List[int] = []
+        self.position = 0
+        self.upcoming = math.inf
+        if frame_rate > 0:
+            self.last = self.start()
+            self.fill()
+
+    def start(self) -> float:
+        return 0.0
+
+    @abstractmethod
+    def gaps(self, size: int) -> np.ndarray:
+        """Draw the gaps before the next arrivals, in micro seconds."""
+        pass
+
+    def fill(self):
+        times = self.last + np.cumsum(self.gaps(self.batch))
+        self.last = float(times[-1])
+        self.arrivals = (np.ceil(times / self.step) * self.step).astype(np.int64).tolist()
+        self.position = 0
+        self.upcoming = self.arrivals[0]
+
+    def next_arrival(self, at: int) -> Optional[int]:
+        while self.upcoming < at:
+            if self.arrivals[-1] < at:
+                self.fill()
+                continue
+            self.position = bisect.bisect_left(self.arrivals, at, self.position)
+            self.upcoming = self.arrivals[self.position]
+        return None if self.upcoming == math.inf else self.upcoming
+
+    def arrived(self, at: int) -> bool:
+        if self.upcoming > at:
+            return False
+        if self.upcoming < at and self.next_arrival(at) != at:
+            return False
+
+        self.position += 1
+        if self.position == len(self.arrivals):
+            self.fill()
+        else:
+            self.upcoming = self.arrivals[self.position]
+        return True
+
+
+class BernoulliTraffic(Traffic):
+    """A frame arrives on every tick with the probability of the frame rate."""
+
+    def gaps(self, size: int) -> np.ndarray:
+        probability = self.step * self.frame_rate / ONE_SECOND
+        if probability >= 1:
+            return np.full(size, self.step)
+        return self.rng.geometric(probability, size) * self.step
+
+
+class PoissonTraffic(Traffic):
+    """Frames arrive with the exponential gaps of the frame rate."""
+
+    def gaps(self, size: int) -> np.ndarray:
+        return self.rng.exponential(ONE_SECOND / self.frame_rate, size)
+
+
+class CBRTraffic(Traffic):
+    """Frames arrive on the constant period of the frame rate, from a random phase."""
+
+    def start(self) -> float:
+        return -self.rng.uniform(0, ONE_SECOND / self.frame_rate)
+
+    def gaps(self, size: int) -> np.ndarray:
+        return np.full(size, ONE_SECOND / self.frame_rate)
+
+
+class OnOffTraffic(Traffic):
+    """Frames arrive in bursts, with the exponential gaps of a peak rate while the source is on.
+
+    The on and the off periods are exponential with the given means,
+    and the peak rate keeps the frame rate on average.
+    """
+
+    def __init__(
+        self,
+        frame_rate: float,
+        step: int,
+        rng: np.random.Generator,
+        on_time: float,
+        off_time: float,
+    ):
+        self.on_time = on_time
+        self.off_time = off_time
+        # the on time left after the last drawn arrival
+        self.on_left = 0.0
+        super().__init__(frame_rate, step, rng)
+
+    def start(self) -> float:
+        self.on_left = self.rng.exponential(self.on_time)
+        # off at the start as long as the source is off on average
+        if self.rng.uniform() < self.off_time / (self.on_time + self.off_time):
+            return self.rng.exponential(self.off_time)
+        return 0.0
+
+    def gaps(self, size: int) -> np.ndarray:
+        peak_rate = self.frame_rate * (self.on_time + self.off_time) / self.on_time
+        # the arrivals on the clock which only runs while the source is on
+        on = np.cumsum(self.rng.exponential(ONE_SECOND / peak_rate, size))
+        periods = [self.on_left]
+        while sum(periods) < on[-1]:
+            periods.extend(self.rng.exponential(self.on_time, size // 8 + 1))
+        ends = np.cumsum(periods)
+        index = np.searchsorted(ends, on)
+        # the off time before every period
+        offs = np.concatenate(
+            ([0.0], np.cumsum(self.rng.exponential(self.off_time, len(periods) - 1)))
+        )
+        self.on_left = float(ends[index[-1]] - on[-1])
+        return np.diff(on + offs[index], prepend=0.0)
@@ -1,11 +1,44 @@
-from typing import Type
+import math
+import random
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Type
 from constant import ONE_SECOND
 from core.abc.frame import AbstractFrame, AbstractFrameStorage
 from core.abc.transmitter import AbstractTransmitter
 from core.abc.csma import AbstractCSMA
+from utils.counter import FrameCounter
+from utils.interval import IntervalSet
+
+if TYPE_CHECKING:
+    from core.time.wheel import Timer, TimerWheel
 
 
 class Transmitter(AbstractTransmitter):
+    __slots__ = (
+        "station_id",
+        "data_rate",
+        "send_frames",
+        "recv_frames",
+        "windows",
+        "detected_at",
+        "collided",
+        "captured",
+        "with_rts",
+        "recv",
+        "recv_current",
+        "sent",
+        "sent_current",
+        "collisions",
+        "last_sent",
+        "wasted",
+        "csma",
+        "timeout",
+        "timers",
+        "timeout_timer",
+        "timed_out",
+        "on_expire",
+        "send_done_at",
+    )
+
     def __init__(
         self,
         station_id: int,
@@ -15,47 +48,52 @@ class Transmitter(AbstractTransmitter):
         with_rts: bool,
         frame_storage: Type[AbstractFrameStorage],
         csma: Type[AbstractCSMA],
+        timers: "TimerWheel",
+        rng: Optional[random.Random] = None,
+        on_expire: Optional[Callable[[], None]] = None,
     ):
         self.station_id = station_id
         self.data_rate = data_rate
         self.send_frames = frame_storage(send_queue_size)
         self.recv_frames = frame_storage(recv_queue_size)
-        self.detected_frames = frame_storage()
+        self.windows: IntervalSet[AbstractFrame] = IntervalSet()
+        self.detected_at = 0
+        self.collided: Dict[Tuple[int, int], int] = {}
+        self.captured = 0
         self.with_rts = with_rts
-        self.recv = []
+        self.recv = FrameCounter()
         self.recv_current = 0
-        self.sent = []
+        self.sent = FrameCounter()
         self.sent_current = 0
         self.collisions = 0
         self.last_sent = None
         self.wasted = 0
-        self.csma = csma(data_rate=self.data_rate)
+        self.csma = csma(
+            data_rate=self.data_rate, timers=timers, rng=rng, on_expire=on_expire
+        )
         self.timeout = self.csma.sifs_amount + 2 * self.csma.frame_time
+        self.timers = timers
+        self.timeout_timer: Optional["Timer"] = None
+        self.timed_out = False
+        self.on_expire = on_expire
+        self.send_done_at = 0
+
+    def airtime(self, frame: AbstractFrame) -> float:
+        return frame.size * ONE_SECOND / self.data_rate
 
     def add_recv_record(self, frame: AbstractFrame):
-        i = 0
-        for record in self.recv:
-            if record["typ"] == frame.typ:
-                self.recv[i]["count"] += 1
-                self.recv[i]["size"] += frame.size
-                break
-            i += 1
-        self.recv.append({"typ": frame.typ, "count": 1, "size": frame.size})
+        self.recv.add(frame.typ, frame.size, self.airtime(frame))
 
     def add_sent_record(self, frame: AbstractFrame):
-        i = 0
-        for record in self.sent:
-            if record["typ"] == frame.typ:
-                self.sent[i]["count"] += 1
-                self.sent[i]["size"] += frame.size
-                break
-            i += 1
-        self.sent.append({"typ": frame.typ, "count": 1, "size": frame.size})
+        self.sent.add(frame.typ, frame.size, self.airtime(frame))
 
     def on_receive_success(self):
         frame = self.recv_frames.pop()
         self.add_recv_record(frame)
         self.recv_current = 0
+        # heard alone long enough, whatever overlapped the rest of it
+        if self.windows.overlapping(frame.id, self.detected_at):
+            self.captured += 1
         if frame.typ == "DATA":
             self.on_data(frame)
         elif frame.typ == "ACK":
@@ -67,53 +105,78 @@ class Transmitter(AbstractTransmitter):
         return
 
     def on_receive_failure(self):
-        self.recv_frames.pop()
+        frame = self.recv_frames.pop()
         self.recv_current = 0
+        for other in self.windows.overlapping(frame.id, self.detected_at):
+            pair = (frame.sender.id, other.sender.id)
+            self.collided[pair] = self.collided.get(pair, 0) + 1
 
     def on_timeout(self):
         self.collisions += 1
         self.wasted += self.timeout
         self.csma.collision_occured()
 
+    def detect(self, at: int):
+        self.detected_at = at
+        if not self.windows.windows:
+            return
+        receiving = self.recv_frames.get()
+        self.windows.prune(at, receiving.id if receiving is not None else None)
+        for frame in self.windows.starting(at):
+            self.on_detect(frame)
+
     def on_detect(self, frame: AbstractFrame):
-        self.detected_frames.push(frame)
-        if not self.talkover_detected():
-            if frame.typ == "CTS":
-                self.recv_frames.push(frame)
-            elif frame.typ == "RTS":
-                self.recv_frames.push(frame)
-            elif frame.receiver.id == self.station_id:
-                self.recv_frames.push(frame)
-
-    def talkover_detected(self) -> bool:
-        return self.detected_frames.count() > 1
+        # the first head heard while idle is received, the overlaps decide at the end
+        if self.is_receiving() or self.is_sending():
+            return
+        if frame.typ == "CTS":
+            self.recv_frames.push(frame)
+        elif frame.typ == "RTS":
+            self.recv_frames.push(frame)
+        elif frame.receiver.id == self.station_id:
+            self.recv_frames.push(frame)
 
     def is_medium_busy(self) -> bool:
-        if not self.detected_frames.is_empty():
-            return True
-        return False
+        if not self.windows.windows:
+            return False
+        return bool(self.windows.covering(self.detected_at))
 
     def is_receiving(self) -> bool:
         return self.recv_frames.count() > 0
 
     def proceed_recv(self, step: int):
         frame = self.recv_frames.get()
+        # the bits heard while no other frame overlapped, until the end of this tick
+        heard = self.windows.uncovered(frame.id, self.detected_at + step)
+        self.recv_current = heard * self.data_rate / ONE_SECOND
 
-        if self.detected_frames.is_empty():
-            # some data frame is lost, most likely due to collision
-            self.on_receive_failure()
-        elif self.talkover_detected():
-            # talkover (collision) occurs
-            pass
-        elif self.detected_frames.get().id != frame.id:
-            # receiving frame ended, and detected frame is the one which made the collision
+        if self.recv_current >= frame.size:
+            self.on_receive_success()
+            return
+
+        window = self.windows.get(frame.id)
+        if window.end is not None and window.end <= self.detected_at + step:
+            # the tail left without enough clean bits, most likely due to collision
             self.on_receive_failure()
-        else:
-            received = step * self.data_rate / ONE_SECOND
-            self.recv_current += received
 
-            if self.recv_current >= frame.size:
-                self.on_receive_success()
+    def recv_decided_at(self, step: int) -> Optional[int]:
+        frame = self.recv_frames.get()
+        window = self.windows.get(frame.id)
+        # the clean time which makes ``recv_current`` reach the size of the frame
+        needed = math.ceil(frame.size * ONE_SECOND / self.data_rate)
+        while (needed - 1) * self.data_rate / ONE_SECOND >= frame.size:
+            needed -= 1
+        while needed * self.data_rate / ONE_SECOND < frame.size:
+            needed += 1
+
+        decided = []
+        heard = self.windows.reaching(frame.id, needed)
+        if heard is not None:
+            # the first tick whose end is after the time
+            decided.append(-(-(heard - step) // step) * step)
+        if window.end is not None:
+            decided.append(window.end - step)
+        return min(decided) if decided else None
 
     def push(self, frame: AbstractFrame):
         if self.csma.is_difs(self.with_rts, frame):
@@ -136,16 +199,20 @@ class Transmitter(AbstractTransmitter):
         frame = self.send_frames.get()
         frame.depart()
         if frame.typ != "ACK":
-            self.last_sent = frame
+            self.wait_ack(frame)
+        # the last bit is sent on the first tick which goes over the size
+        ticks = math.floor(frame.size / (step * self.data_rate / ONE_SECOND)) + 1
+        self.send_done_at = frame.sent + (ticks - 1) * step
+        if self.send_done_at > self.timers.now and self.on_expire is not None:
+            self.timers.add(self.send_done_at, self.on_expire)
         self.proceed_send(step)
 
     def proceed_send(self, step: int):
         frame = self.send_frames.get()
-        sent = step * self.data_rate / ONE_SECOND
-
-        self.sent_current += sent
+        now = self.timers.now
+        self.sent_current = (now - frame.sent + step) * self.data_rate / ONE_SECOND
 
-        if self.sent_current > frame.size:
+        if now >= self.send_done_at:
             frame.done()
             self.add_sent_record(frame)
             self.sent_current = 0
@@ -159,12 +226,12 @@ class Transmitter(AbstractTransmitter):
             typ="ACK",
         )
         self.push(ack_frame)
-        self.last_sent = None
+        self.acked()
 
     def on_ack(self, frame: AbstractFrame):
         self.csma.reset_backoff_range()
         self.csma.set_difs()
-        self.last_sent = None
+        self.acked()
 
     def on_rts(self, frame: AbstractFrame):
         if frame.receiver.id == self.station_id:
@@ -190,23 +257,47 @@ class Transmitter(AbstractTransmitter):
             )
             self.push(data_frame)
             self.csma.set_allocated(frame.duration)
-            self.last_sent = None
+            self.acked()
         else:
             self.csma.set_nav(frame.duration)
 
+    def wait_ack(self, frame: AbstractFrame):
+        self.acked()
+        self.last_sent = frame
+        self.timeout_timer = self.timers.add(self.timeout_at(), self.expire_timeout)
+
+    def expire_timeout(self):
+        # handled when the station proceeds on this tick
+        self.timeout_timer = None
+        self.timed_out = True
+        if self.on_expire is not None:
+            self.on_expire()
+
+    def acked(self):
+        self.last_sent = None
+        self.timers.cancel(self.timeout_timer)
+        self.timeout_timer = None
+        self.timed_out = False
+
     def is_acked(self) -> bool:
         return self.last_sent is None
 
     def timeout_occured(self, current: int):
-        if not self.is_acked():
-            if self.last_sent.sent + self.timeout < current:
-                self.last_sent = None
-                return True
+        if self.timed_out:
+            self.acked()
+            return True
         return False
 
+    def timeout_at(self) -> Optional[int]:
+        if self.is_acked():
+            return None
+        return self.last_sent.sent + self.timeout + 1
+
     def okay_to_send(self, step: int) -> bool:
         if self.is_acked():
             is_busy = self.is_medium_busy()
             csma_ok = self.csma.check_and_decrease(is_busy, step)
             return (not is_busy) and csma_ok
+        # the phases only count while the station contends
+        self.csma.hold()
         return False
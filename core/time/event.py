@@ -0,0 +1,50 @@
+from typing import Dict, List, Optional
+
+from core.time.line import TimeLine
+
+
+class EventTimeLine(TimeLine):
+    """Visit only the ticks with a due event, and only the stations which are due on them.
+
+    The state changes of the stations are scheduled: the timers of the counters, the timeout
+    and the sent frames, the heads and the tails of the frames heard, and the traffic arrivals.
+    The stations ask for them with ``wake()`` and the timers are kept by the wheel,
+    so the next tick is the earliest of both.
+    """
+
+    event_driven = True
+
+    def __init__(
+        self,
+        interval: float,
+        step: int,
+        max_time: int,
+        area_size: int,
+        notation: List[Dict] = [],
+        log_screen: bool = True,
+        max_step: Optional[int] = None,
+    ):
+        super().__init__(
+            interval=interval,
+            step=step,
+            max_time=max_time,
+            area_size=area_size,
+            notation=notation,
+            log_screen=log_screen,
+            active_set=True,
+            max_step=max_step,
+        )
+
+    def tick(self):
+        at = self.next_wake()
+        timer_at = self.timers.next_expiry()
+        if timer_at is not None and (at is None or timer_at < at):
+            at = timer_at
+        if at is None:
+            # nobody can change state anymore
+            at = self.end
+        at = max(min(self.bound(at), self.end), self.current + self.step)
+        step = at - self.current
+        self.current = at
+        self.timers.advance(self.current)
+        self.dispatch(step)
@@ -1,13 +1,21 @@
+import heapq
 import time
-from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .participant import TimeParticipant
 
+from core.time.wheel import TimerWheel
 from utils.area import AreaDrawer
 
 
 class TimeLine:
+    event_driven = False
+    # participants are grouped by kind, and the groups are visited in this order
+    kinds = ("medium", "station", "other", "frame", "drawing")
+    phases = ("on_tick_init", "on_tick")
+
     def __init__(
         self,
         interval: float,
@@ -16,6 +24,9 @@ class TimeLine:
         area_size: int,
         notation: List[Dict] = [],
         log_screen: bool = True,
+        fast_forward: bool = False,
+        active_set: bool = False,
+        max_step: Optional[int] = None,
     ):
         self.current = 0
         self.step = step
@@ -23,29 +34,202 @@ class TimeLine:
         self.area_size = area_size
         self.interval = interval
         self.log_screen = log_screen
-        self.participants: List["TimeParticipant"] = []
-        self.drawer = AreaDrawer(area_size, notation)
+        # dicts keep the insertion order and remove in O(1)
+        self.groups: Dict[str, Dict["TimeParticipant", None]] = {
+            kind: {} for kind in self.kinds
+        }
+        # per phase, only the participants which override the hook
+        self.hooks: Dict[str, Dict[str, Dict["TimeParticipant", None]]] = {
+            phase: {kind: {} for kind in self.kinds} for phase in self.phases
+        }
+        self.class_hooks: Dict[type, Tuple[str, ...]] = {}
+        self.dispatched: Dict[str, int] = {phase: 0 for phase in self.phases}
+        # drawings never change the state, frames only draw themselves
+        self.ticked = ("medium", "station", "other") + (
+            ("frame",) if log_screen else ()
+        )
+        self.drawer = AreaDrawer(area_size, notation) if log_screen else None
         self.after_tick: Optional[Callable] = None
+        self.fast_forward = fast_forward
+        self.max_step = max_step
+        self.timers = TimerWheel(step)
+        self.end = self.align(max_time)
+
+        # only the stations which are woken are ticked,
+        # the others are woken by their timers, or at the time they asked for
+        self.active_set = active_set and self.skips_ticks
+        self.waking: Dict[int, Dict["TimeParticipant", None]] = {}
+        self.wake_times: List[int] = []
+        self.wake_of: Dict["TimeParticipant", int] = {}
+        self.last_tick: Dict["TimeParticipant", int] = {}
+        self.order: Dict["TimeParticipant", int] = {}
+
+    @property
+    def skips_ticks(self) -> bool:
+        return self.event_driven or self.fast_forward
+
+    @property
+    def participants(self) -> List["TimeParticipant"]:
+        return list(chain.from_iterable(self.groups.values()))
+
+    def group(self, kind: str) -> Dict["TimeParticipant", None]:
+        return self.groups[kind]
+
+    def next_wake(self) -> Optional[int]:
+        # woken ones might have been ticked earlier and woken again
+        while self.wake_times and not self.waking[self.wake_times[0]]:
+            del self.waking[heapq.heappop(self.wake_times)]
+        return self.wake_times[0] if self.wake_times else None
+
+    def next_event_time(self) -> int:
+        at = self.next_wake() if self.active_set else None
+        for participant in self.iterate(self.ticked):
+            if self.active_set and participant.kind == "station":
+                continue
+            participant_at = participant.next_event_time()
+            if participant_at is not None and (at is None or participant_at < at):
+                at = participant_at
+        timer_at = self.timers.next_expiry()
+        if timer_at is not None and (at is None or timer_at < at):
+            at = timer_at
+        if at is None:
+            # nobody can change state anymore
+            at = self.end
+        return max(min(self.align(at), self.end), self.current + self.step)
+
+    def bound(self, at: int) -> int:
+        # skipping ticks stops at the multiples of max_step,
+        # which are slot boundaries if it is a multiple of the slot time
+        if self.max_step is None:
+            return at
+        return min(at, self.align((self.current // self.max_step + 1) * self.max_step))
 
     def tick(self):
-        self.current += self.step
-        for participant in self.participants:
-            participant.on_tick_init(self.step)
+        at = self.current + self.step
+        if self.fast_forward:
+            at = self.bound(self.next_event_time())
+        step = at - self.current
+        self.current = at
+        self.timers.advance(self.current)
+        self.dispatch(step)
+
+    def iterate(self, kinds):
+        for kind in kinds:
+            yield from self.groups[kind]
+
+    def dispatch(self, step: int):
+        hooks = self.hooks["on_tick_init"]
+        for kind in self.ticked:
+            self.dispatched["on_tick_init"] += len(hooks[kind])
+            for participant in hooks[kind]:
+                participant.on_tick_init(step)
 
-        for participant in self.participants:
-            participant.on_tick(self.step)
+        hooks = self.hooks["on_tick"]
+        for kind in self.ticked:
+            if kind == "station" and self.active_set:
+                self.dispatch_active()
+                continue
+            self.dispatched["on_tick"] += len(hooks[kind])
+            for participant in hooks[kind]:
+                participant.on_tick(step)
+
+    def dispatch_active(self):
+        active: Dict["TimeParticipant", None] = {}
+        while self.wake_times and self.wake_times[0] <= self.current:
+            active.update(self.waking.pop(heapq.heappop(self.wake_times)))
+
+        self.dispatched["on_tick"] += len(active)
+        # in the order of the registration, like every station is ticked
+        for participant in sorted(active, key=self.order.__getitem__):
+            # the next wake is made again after the tick
+            woken = self.wake_of.pop(participant, None)
+            if woken is not None and woken > self.current:
+                del self.waking[woken][participant]
+            step = self.current - self.last_tick[participant]
+            self.last_tick[participant] = self.current
+            participant.on_tick(step)
+
+    def wake(self, participant: "TimeParticipant", at: Optional[int]):
+        if at is None:
+            return
+        at = max(self.align(at), self.current + self.step)
+        if at > self.end:
+            return
+        woken = self.wake_of.get(participant)
+        if woken is not None and woken != at:
+            del self.waking[woken][participant]
+        if at not in self.waking:
+            self.waking[at] = {}
+            heapq.heappush(self.wake_times, at)
+        self.waking[at][participant] = None
+        self.wake_of[participant] = at
+
+    def wake_by(self, participant: "TimeParticipant", at: int):
+        # an earlier wake, or the tick on the way in the current one, is kept
+        woken = self.wake_of.get(participant)
+        if woken is not None and woken <= max(self.align(at), self.current + self.step):
+            return
+        self.wake(participant, at)
+
+    def due(self, participant: "TimeParticipant"):
+        # woken by a timer, which fire before the participants of the tick are visited
+        if not self.active_set:
+            return
+        woken = self.wake_of.get(participant)
+        if woken == self.current:
+            return
+        if woken is not None:
+            del self.waking[woken][participant]
+        if self.current not in self.waking:
+            self.waking[self.current] = {}
+            heapq.heappush(self.wake_times, self.current)
+        self.waking[self.current][participant] = None
+        self.wake_of[participant] = self.current
+
+    def phase_counts(self) -> Dict[str, int]:
+        # participants visited by each phase of a tick
+        return {
+            phase: sum(len(self.hooks[phase][kind]) for kind in self.ticked)
+            for phase in self.phases
+        }
+
+    def align(self, at: int) -> int:
+        return -(-at // self.step) * self.step
 
     def set_after_tick(self, callback: Callable[["TimeLine"], None]):
         self.after_tick = callback
 
     def add_participant(self, participant: "TimeParticipant"):
-        self.participants.append(participant)
+        kind = participant.kind
+        self.groups[kind][participant] = None
+
+        cls = type(participant)
+        if cls not in self.class_hooks:
+            self.class_hooks[cls] = cls.hooks()
+        for phase in self.class_hooks[cls]:
+            self.hooks[phase][kind][participant] = None
+
+        if kind == "station":
+            self.order[participant] = len(self.order)
+            self.last_tick[participant] = self.current
+            if self.active_set:
+                self.wake(participant, self.current + self.step)
+
+    def remove_participant(self, participant: "TimeParticipant"):
+        kind = participant.kind
+        del self.groups[kind][participant]
+        for phase in self.class_hooks[type(participant)]:
+            del self.hooks[phase][kind][participant]
+        self.last_tick.pop(participant, None)
+        woken = self.wake_of.pop(participant, None)
+        if woken is not None:
+            del self.waking[woken][participant]
 
     def run(self):
         while self.current < self.max_time:
             self.tick()
             if self.log_screen:
-                self.drawer.draw_screen(self.participants)
+                self.drawer.draw_screen(self.groups)
             if self.after_tick:
                 self.after_tick(self)
 
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Tuple
 
 if TYPE_CHECKING:
     from .line import TimeLine
@@ -9,18 +9,40 @@ from core.container import DIContainer
 
 
 class TimeParticipant:
+    __slots__ = ()
+
+    # the participant group in the timeline, see ``TimeLine.kinds``
+    kind = "other"
+
     @inject
     def register(self, timeline: "TimeLine" = Provide[DIContainer.timeline]):
+        self.join(timeline)
+
+    def join(self, timeline: "TimeLine"):
+        # register without going through the injection, for the hot paths
         self.timeline = timeline
         timeline.add_participant(self)
 
     def unregister(self):
-        self.timeline.participants.remove(self)
+        self.timeline.remove_participant(self)
+
+    @classmethod
+    def hooks(cls) -> Tuple[str, ...]:
+        # the tick phases overridden, the empty ones here are never dispatched
+        return tuple(
+            phase
+            for phase in ("on_tick_init", "on_tick")
+            if getattr(cls, phase) is not getattr(TimeParticipant, phase)
+        )
 
     @property
     def current(self) -> int:
         return self.timeline.current
 
+    def next_event_time(self) -> Optional[int]:
+        # without knowing better, anything may happen on the next tick
+        return self.timeline.current + self.timeline.step
+
     def on_tick_init(self, step: int):
         pass
 
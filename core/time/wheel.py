@@ -0,0 +1,156 @@
+from typing import Callable, List, Optional
+
+
+class Timer:
+    __slots__ = ("tick", "seq", "callback", "cancelled")
+
+    def __init__(self, tick: int, seq: int, callback: Callable[[], None]):
+        self.tick = tick
+        self.seq = seq
+        self.callback = callback
+        self.cancelled = False
+
+
+class TimerWheel:
+    """Hierarchical timer wheel counted in ticks of the timeline.
+
+    A timer is kept in the lowest level whose block of ticks it shares with the current tick,
+    at the slot of its tick in that level.
+    When the current tick enters a new block of a level, the slot of the block is cascaded to the lower levels,
+    so only the timers which are about to expire are touched on a tick.
+    """
+
+    bits = 6
+    levels = 4
+
+    def __init__(self, step: int):
+        self.step = step
+        self.tick = 0
+        # the time of the current tick, read by the counters
+        self.now = 0
+        self.seq = 0
+        self.size = 0
+        self.mask = (1 << self.bits) - 1
+        self.wheels: List[List[List[Timer]]] = [
+            [[] for _ in range(1 << self.bits)] for _ in range(self.levels)
+        ]
+        self.overflow: List[Timer] = []
+        # the earliest timer found by ``next_expiry``, until it fires or is cancelled
+        self.earliest: Optional[Timer] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, at: int, callback: Callable[[], None]) -> Timer:
+        # expired timers fire on the next tick
+        tick = max(-(-at // self.step), self.tick + 1)
+        self.seq += 1
+        timer = Timer(tick, self.seq, callback)
+        self.place(timer)
+        self.size += 1
+        earliest = self.earliest
+        if earliest is not None and not earliest.cancelled and tick < earliest.tick:
+            self.earliest = timer
+        return timer
+
+    def cancel(self, timer: Optional[Timer]):
+        if timer is None or timer.cancelled:
+            return
+        timer.cancelled = True
+        self.size -= 1
+
+    def place(self, timer: Timer):
+        for level in range(self.levels):
+            shift = self.bits * (level + 1)
+            if timer.tick >> shift == self.tick >> shift:
+                index = (timer.tick >> (self.bits * level)) & self.mask
+                self.wheels[level][index].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def cascade(self):
+        for level in range(1, self.levels):
+            if self.tick & ((1 << (self.bits * level)) - 1):
+                return
+            index = (self.tick >> (self.bits * level)) & self.mask
+            timers, self.wheels[level][index] = self.wheels[level][index], []
+            for timer in timers:
+                if not timer.cancelled:
+                    self.place(timer)
+
+        if self.tick & ((1 << (self.bits * self.levels)) - 1) == 0:
+            timers, self.overflow = self.overflow, []
+            for timer in timers:
+                if not timer.cancelled:
+                    self.place(timer)
+
+    def advance(self, now: int):
+        """Move the wheel to the time, and fire the expired timers in the order of expiry."""
+        target = now // self.step
+        if self.size == 0:
+            # cancelled timers left in the slots are skipped anyway
+            self.tick = max(self.tick, target)
+            self.now = self.tick * self.step
+            return
+        if target - self.tick > (1 << self.bits):
+            self.jump(target)
+            return
+
+        while self.tick < target:
+            self.tick += 1
+            self.now = self.tick * self.step
+            self.cascade()
+            index = self.tick & self.mask
+            timers, self.wheels[0][index] = self.wheels[0][index], []
+            self.fire(timers)
+
+    def jump(self, target: int):
+        # far jumps rebuild the wheel instead of visiting every tick on the way
+        timers = [timer for timer in self.timers() if not timer.cancelled]
+        for level in self.wheels:
+            for index in range(len(level)):
+                level[index] = []
+        self.overflow = []
+        self.tick = target
+        self.now = target * self.step
+
+        for timer in timers:
+            if timer.tick > target:
+                self.place(timer)
+        self.fire([timer for timer in timers if timer.tick <= target])
+
+    def fire(self, timers: List[Timer]):
+        for timer in sorted(timers, key=lambda timer: (timer.tick, timer.seq)):
+            if timer.cancelled:
+                continue
+            timer.cancelled = True
+            self.size -= 1
+            timer.callback()
+
+    def timers(self) -> List[Timer]:
+        timers = [timer for level in self.wheels for slot in level for timer in slot]
+        return timers + self.overflow
+
+    def next_expiry(self) -> Optional[int]:
+        """Get the time of the earliest timer, None if there is no timer."""
+        if self.size == 0:
+            return None
+        earliest = self.earliest
+        if earliest is not None and not earliest.cancelled:
+            return earliest.tick * self.step
+
+        for level in range(self.levels):
+            start = ((self.tick >> (self.bits * level)) & self.mask) + 1
+            for index in range(start, 1 << self.bits):
+                timers = [
+                    timer for timer in self.wheels[level][index] if not timer.cancelled
+                ]
+                if timers:
+                    self.earliest = min(timers, key=lambda timer: timer.tick)
+                    return self.earliest.tick * self.step
+
+        timers = [timer for timer in self.overflow if not timer.cancelled]
+        if not timers:
+            return None
+        self.earliest = min(timers, key=lambda timer: timer.tick)
+        return self.earliest.tick * self.step
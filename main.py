@@ -1,9 +1,6 @@
-import os
 import sys
-import random
-from typing import Type, Dict
-from tqdm.contrib.concurrent import process_map
-from tqdm import tqdm
+from functools import partial
+from typing import Callable, List, Optional, Type, Dict
 
 from dependency_injector.wiring import Provide, inject
 
@@ -14,15 +11,33 @@ from core.implements import (
     Frame,
     FrameRadius,
     FrameStorage,
+    RingFrameStorage,
     FramePath,
     FrameRadiusEdge,
     CSMA,
+    BernoulliTraffic,
+    PoissonTraffic,
+    CBRTraffic,
+    OnOffTraffic,
+    frame_factory,
 )
+from utils.rng import RandomStreams
+from utils.cost import CostModel, longest_first
+from utils.sweep import Sweep
 from core.time.line import TimeLine
 from core.container import DIContainer
-from config import default_settings, various_settings
+from config import (
+    default_settings,
+    various_settings,
+    regression_seeds,
+    regression_settings,
+    sweep_settings,
+)
 from utils.log import (
-    log_result,
+    get_sweep_log,
+    parse_results,
+    save_results,
+    saved_runs,
     logger_factory,
     station_notate,
     frame_notate,
@@ -35,28 +50,88 @@ def simulate(
     settings: Dict = Provide[DIContainer.config.settings],
     timeline: TimeLine = Provide[DIContainer.timeline],
     medium: Type[Medium] = Provide[DIContainer.medium],
+    frame: Optional[Callable[..., Frame]] = Provide[DIContainer.config.frame_factory],
 ):
-    medium = medium(
-        star_topology=settings["star_topology"],
-        propagation_speed=settings["propagation_speed"],
-        station_count=settings["station_count"],
-        area_size=settings["area_size"],
-    )
-    medium.init_stations(
-        data_rate=settings["data_rate"],
-        frame_rate=settings["frame_rate"],
-        detect_range=settings["detect_range"],
-        slot_time=settings["slot_time"],
-        with_rts=settings["with_rts"],
-    )
+    replicas = settings["replicas"]
+    streams = RandomStreams(settings["seed"])
+    for index in range(replicas):
+        replica = medium(
+            star_topology=settings["star_topology"],
+            propagation_speed=settings["propagation_speed"],
+            station_count=settings["station_count"],
+            area_size=settings["area_size"],
+            spatial_index=settings["spatial_index"],
+            frame_factory=frame,
+            streams=streams.spawn(index),
+        )
+        replica.init_stations(
+            data_rate=settings["data_rate"],
+            frame_rate=settings["frame_rate"],
+            detect_range=settings["detect_range"],
+            slot_time=settings["slot_time"],
+            with_rts=settings["with_rts"],
+        )
     if settings["log"]:
         timeline.set_after_tick(logger_factory(settings))
     timeline.run()
     return timeline
 
 
-def wire(settings: Dict = default_settings):
-    di_container = DIContainer()
+traffics = {
+    "bernoulli": BernoulliTraffic,
+    "poisson": PoissonTraffic,
+    "cbr": CBRTraffic,
+    "on_off": OnOffTraffic,
+}
+
+
+def resolve(settings: Dict, frame_storage: Type, csma: Type, traffic: Type) -> Dict:
+    # bind the settings and the implementations once,
+    # so the constructors are not resolved by the container for every object
+    csma = partial(
+        csma,
+        frame_size=settings["frame_size"],
+        slot_time=settings["slot_time"],
+        sifs_amount=settings["sifs"],
+        backoff_min=settings["backoff_min"],
+        backoff_max=settings["backoff_max"],
+    )
+    return {
+        "station": partial(
+            Station,
+            send_queue_size=settings["send_queue_size"],
+            transmitter=Transmitter,
+            frame=Frame,
+            frame_storage=frame_storage,
+            csma=csma,
+            traffic=traffic,
+        ),
+        "csma": csma,
+        "frame_factory": frame_factory(settings["frame_size"]),
+    }
+
+
+def configure(di_container: DIContainer, settings: Dict):
+    frame_storage = (
+        RingFrameStorage if settings["frame_storage"] == "ring" else FrameStorage
+    )
+    traffic = traffics[settings["traffic"]]
+    if traffic is OnOffTraffic:
+        traffic = partial(
+            OnOffTraffic,
+            on_time=settings["on_time"],
+            off_time=settings["off_time"],
+        )
+    implements = {
+        "station": Station,
+        "csma": CSMA,
+        "frame_factory": None,
+    }
+    if settings["resolve_providers"]:
+        implements = resolve(settings, frame_storage, CSMA, traffic)
+
+    # the config of the previous run is replaced, not merged
+    di_container.config.reset_override()
     di_container.config.from_dict(
         {
             "settings": {
@@ -71,20 +146,144 @@ def wire(settings: Dict = default_settings):
                 {"instance": "default", "notation": "  "},
             ],
             "medium": Medium,
-            "station": Station,
             "frame": Frame,
-            "frame_storage": FrameStorage,
+            "frame_storage": frame_storage,
             "transmitter": Transmitter,
-            "csma": CSMA,
+            "traffic": traffic,
+            **implements,
         }
     )
+
+
+def wire(settings: Dict = default_settings) -> DIContainer:
+    di_container = DIContainer()
+    configure(di_container, settings)
     di_container.wire(modules=[__name__])
+    return di_container
+
+
+# wired once in a sweep worker, see ``preload_worker()``
+worker_container: Optional[DIContainer] = None
+
 
+def preload_worker(settings: Dict = default_settings):
+    """Wire the container once for the runs of a sweep worker.
 
-def simulate_and_save_result(settings: Dict = default_settings):
-    wire(settings)
-    timeline = simulate()
-    log_result(timeline, settings)
+    The runs only replace the config of the container and reset the timeline singleton,
+    instead of building and wiring a new container every time.
+    """
+    global worker_container
+    worker_container = wire(settings)
+
+
+def run_simulation(settings: Dict) -> List[Dict]:
+    if worker_container is None:
+        wire(settings)
+    else:
+        configure(worker_container, settings)
+        worker_container.reset_singletons()
+    return parse_results(simulate(), settings)
+
+
+def save_report(report: Dict):
+    # the measured times are kept with the results of the run,
+    # and the run identifies the rows whatever the order the runs finished in
+    settings = report["settings"]
+    run = {
+        "seed": settings["seed"],
+        "run": settings.get("run", 0),
+        # what the wall time depends on besides the summary of the file, see ``utils.cost``
+        "replicas": settings["replicas"],
+        "engine": settings["engine"],
+        "fast_forward": settings["fast_forward"],
+        "wall_time": report["wall_time"],
+        "us_per_second": report["us_per_second"],
+    }
+    save_results([{**result, **run} for result in report["results"]], settings)
+
+
+def sweep_runs(settings_list: List[Dict], runs: int, pass_done: bool) -> List[Dict]:
+    # every missing run of the settings, seeded apart from the other runs
+    settings_runs = []
+    for settings in settings_list:
+        done = saved_runs(settings) if pass_done else 0
+        for run in range(done, runs):
+            seed = settings["seed"]
+            settings_runs.append(
+                {**settings, "seed": None if seed is None else seed + run, "run": run}
+            )
+    return settings_runs
+
+
+def option(name: str, default, cast: Callable = int):
+    if name not in sys.argv:
+        return default
+    return cast(sys.argv[sys.argv.index(name) + 1])
+
+
+def stepping_modes(settings: Dict) -> Dict[str, Dict]:
+    # the arrivals are drawn ahead by every mode, so they are the same in all of them
+    return {
+        "fine": {
+            "engine": "step",
+            "fast_forward": False,
+            "active_set": False,
+            "max_step": None,
+        },
+        "slot": {
+            "engine": "step",
+            "fast_forward": True,
+            "active_set": False,
+            "max_step": 8 * settings["slot_time"],
+        },
+        "fast_forward": {
+            "engine": "step",
+            "fast_forward": True,
+            "active_set": True,
+            "max_step": None,
+        },
+        "event": {
+            "engine": "event",
+            "max_step": None,
+        },
+    }
+
+
+# the implementations which the regression set switches, printed with the summary
+variant_settings = (
+    "replicas",
+    "spatial_index",
+    "frame_storage",
+    "traffic",
+    "resolve_providers",
+)
+
+
+def check_stepping(settings_list=regression_settings, seeds=regression_seeds) -> bool:
+    """Run the seeded regression set with every stepping mode, and compare with fine stepping."""
+    same = True
+    for settings in settings_list:
+        for seed in seeds:
+            results = {}
+            for mode, stepping in stepping_modes(settings).items():
+                wire({**settings, **stepping, "seed": seed})
+                # every replica is compared
+                results[mode] = parse_results(simulate(), settings)
+
+            mismatched = [
+                mode for mode, result in results.items() if result != results["fine"]
+            ]
+            same = same and not mismatched
+            variant = "".join(
+                f" {name}={settings[name]}"
+                for name in variant_settings
+                if settings[name] != default_settings[name]
+            )
+            print(
+                f"{summary_settings(settings)}{variant} seed {seed}:",
+                f"differs in {', '.join(mismatched)}" if mismatched else "ok",
+            )
+    return same
 
 
 if __name__ == "__main__":
@@ -99,29 +298,32 @@ if __name__ == "__main__":
     if "--multiprocess" in sys.argv:
         multiprocess = True
 
+    if "--check" in sys.argv:
+        exit(0 if check_stepping() else 1)
+
     if not simulation:
         wire(default_settings)
         timeline = simulate()
         exit()
 
-    settings = (
-        various_settings
-        if not pass_done
-        else [
-            settings
-            for settings in various_settings
-            if f"{summary_settings(settings)}.csv" not in os.listdir("results/csv")
-        ]
+    settings = longest_first(
+        sweep_runs(
+            various_settings, option("--runs", sweep_settings["runs"]), pass_done
+        ),
+        CostModel.from_results(),
     )
 
-    random.shuffle(settings)
-
-    i = 0
-    while True:
-        i += len(settings)
-        if multiprocess:
-            process_map(simulate_and_save_result, settings, max_workers=4)
-        else:
-            for s in tqdm(settings):
-                simulate_and_save_result(s)
-        print(i)
+    sweep = Sweep(
+        run_simulation,
+        save_report,
+        initializer=preload_worker,
+        workers=option(
+            "--workers", sweep_settings["workers"] if multiprocess else 1
+        ),
+        chunksize=option("--chunksize", sweep_settings["chunksize"]),
+        timeout=option("--timeout", sweep_settings["timeout"], float),
+        retries=option("--retries", sweep_settings["retries"]),
+    )
+    reports = sweep.execute(settings)
+    print(get_sweep_log(reports))
+    exit(0 if all(report["status"] == "done" for report in reports) else 1)
@@ -0,0 +1,101 @@
+import csv
+import math
+from typing import Dict
+
+import numpy as np
+
+from utils.cost import CostModel, feature_count, features, load_samples, longest_first
+
+
+def settings(station_count: int, frame_rate: float, with_rts: bool = False, **others) -> Dict:
+    return {
+        "station_count": station_count,
+        "frame_rate": frame_rate,
+        "with_rts": with_rts,
+        "max_time": 1000,
+        "step": 10,
+        **others,
+    }
+
+
+def test_few_samples_use_the_heuristic():
+    samples = [{**settings(10, 100), "wall_time": 1.0}] * (2 * feature_count - 1)
+    model = CostModel.fit(samples)
+
+    assert model.coefficients is None
+    assert model.predict(settings(10, 100)) == 100 * 10 * 2
+    assert model.predict(settings(10, 100, replicas=3)) == 100 * 10 * 3 * 2
+
+
+def test_fit_recovers_the_coefficients():
+    coefficients = np.array([-9.0, 1.2, 0.5, 0.3, 0.9, -1.4, -1.2])
+    samples = []
+    for station_count in (2, 10, 50):
+        for frame_rate in (10, 100, 1000):
+            for with_rts in (False, True):
+                for replicas, engine, fast_forward in (
+                    (1, "step", False),
+                    (2, "step", False),
+                    (2, "event", False),
+                    (4, "step", True),
+                ):
+                    sample = settings(
+                        station_count,
+                        frame_rate,
+                        with_rts,
+                        replicas=replicas,
+                        engine=engine,
+                        fast_forward=fast_forward,
+                    )
+                    sample["wall_time"] = 100 * math.exp(np.dot(coefficients, features(sample)))
+                    samples.append(sample)
+    model = CostModel.fit(samples)
+
+    assert np.allclose(model.coefficients, coefficients)
+    assert math.isclose(model.predict(samples[1]), samples[1]["wall_time"])
+
+
+def test_uniform_engine_still_predicts():
+    samples = []
+    for station_count in (2, 10, 50):
+        for frame_rate in (10, 100, 1000):
+            for with_rts in (False, True):
+                sample = settings(station_count, frame_rate, with_rts, engine="event")
+                sample["wall_time"] = station_count * frame_rate * (2 if with_rts else 1)
+                samples.append(sample)
+    model = CostModel.fit(samples)
+
+    assert math.isclose(model.predict(samples[-1]), samples[-1]["wall_time"])
+
+
+def test_one_sample_for_the_replicas_of_a_run(tmp_path):
+    columns = ["station_count", "frame_rate", "with_rts", "current", "step", "replica"]
+    columns += ["seed", "run", "replicas", "engine", "fast_forward", "wall_time"]
+    rows = [
+        # two replicas of a run, then the next run
+        [10, 100, True, 1000, 10, 0, 1, 0, 2, "event", False, 2.0],
+        [10, 100, True, 1000, 10, 1, 1, 0, 2, "event", False, 2.0],
+        [10, 100, True, 1000, 10, 0, 2, 1, 2, "event", False, 3.0],
+    ]
+    with open(tmp_path / "10_stations_100_fps_4_backoff.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    # saved before the runs and the engines were
+    with open(tmp_path / "3_stations_100_fps_4_backoff.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["station_count", "frame_rate", "with_rts", "current", "step", "wall_time"])
+        writer.writerows([[3, 100, False, 1000, 10, 1.0]] * 2)
+
+    samples = load_samples(str(tmp_path))
+
+    assert [sample["wall_time"] for sample in samples] == [2.0, 3.0, 1.0, 1.0]
+    assert samples[0]["replicas"] == 2 and samples[0]["engine"] == "event"
+    assert samples[2]["replicas"] == 1 and samples[2]["engine"] == "step"
+
+
+def test_longest_first():
+    settings_list = [settings(2, 10), settings(50, 1000), settings(10, 100)]
+    ordered = longest_first(settings_list, CostModel())
+
+    assert [s["station_count"] for s in ordered] == [50, 10, 2]
@@ -0,0 +1,53 @@
+from core.time.wheel import TimerWheel
+from utils.counter import Counter
+
+STEP = 10
+
+
+def test_running_counter_expires_on_the_wheel():
+    wheel = TimerWheel(STEP)
+    expired = []
+    counter = Counter(wheel, slot=20, value=3, on_expire=lambda: expired.append(wheel.now))
+
+    counter.run(wheel.now)
+    wheel.advance(50)
+    assert counter.value == 10
+    assert counter.is_left()
+
+    wheel.advance(60)
+    assert expired == [60]
+    assert not counter.is_left()
+
+
+def test_paused_counter_keeps_the_value():
+    wheel = TimerWheel(STEP)
+    expired = []
+    counter = Counter(wheel, value=50, on_expire=lambda: expired.append(wheel.now))
+    counter.run(0)
+    wheel.advance(20)
+
+    # the tick it is paused on does not count
+    counter.pause(wheel.now)
+    assert counter.value == 40
+    wheel.advance(200)
+    assert counter.value == 40
+    assert expired == []
+
+    counter.run(wheel.now)
+    wheel.advance(240)
+    assert expired == [240]
+
+
+def test_reset_cancels_the_expiry():
+    wheel = TimerWheel(STEP)
+    expired = []
+    counter = Counter(wheel, value=30, on_expire=lambda: expired.append(wheel.now))
+    counter.run(0)
+
+    counter.reset(5)
+    wheel.advance(100)
+
+    assert not counter.running
+    assert counter.value == 5
+    assert expired == []
+    assert len(wheel) == 0
@@ -0,0 +1,63 @@
+import pytest
+
+from config import sim_settings
+from core.implements import Frame
+from main import simulate, wire
+
+
+@pytest.fixture
+def medium():
+    # the stations are made, but no tick is run
+    wire({**sim_settings, "max_time": 0, "station_count": 3, "seed": 1})
+    return next(iter(simulate().group("medium")))
+
+
+def send(medium, sender_id=1, receiver_id=0):
+    sender, receiver = medium.stations[sender_id], medium.stations[receiver_id]
+    frame = Frame.assemble(receiver=receiver, sender=sender, typ="DATA")
+    frame.depart()
+    frame.done()
+    return frame
+
+
+def test_heard_frame_is_held_back(medium):
+    frame = send(medium)
+    # the center still hears the frame
+    assert frame.id in medium.stations[0].transmitter.windows
+
+    medium.release_frame(frame)
+
+    assert medium.retired_frames == [frame]
+    assert medium.acquire_frame() is None
+
+
+def test_held_frame_is_reused_after_its_windows_end(medium):
+    frame = send(medium)
+    frame_id = frame.id
+    medium.release_frame(frame)
+
+    # the window ended long ago, even if the station has not pruned it
+    medium.timeline.current = 10_000
+    assert frame_id in medium.stations[0].transmitter.windows
+    other = send(medium)
+    # the held frames are released again once another frame is gone
+    medium.vanish(other)
+
+    assert medium.retired_frames == [other]
+    reused = Frame.assemble(
+        receiver=medium.stations[0], sender=medium.stations[2], typ="ACK"
+    )
+    assert reused is frame
+    assert reused.id not in (frame_id, other.id)
+    assert reused.typ == "ACK"
+    assert reused.sent is None
+
+
+def test_frame_waiting_for_ack_is_held_back(medium):
+    frame = send(medium)
+    medium.stations[1].transmitter.wait_ack(frame)
+    medium.timeline.current = 10_000
+
+    medium.release_frame(frame)
+
+    assert medium.retired_frames == [frame]
@@ -0,0 +1,69 @@
+import pytest
+
+from core.implements.frame import FrameStorage, RingFrameStorage
+
+
+@pytest.mark.parametrize("storage", [FrameStorage, RingFrameStorage])
+def test_fifo_order(storage):
+    frames = storage(3)
+    for frame in ("a", "b", "c"):
+        frames.push(frame)
+
+    assert frames.is_full()
+    assert frames.get() == "a"
+    assert frames.pop() == "a"
+    assert frames.all() == ["b", "c"]
+
+
+def test_ring_wraps_around():
+    frames = RingFrameStorage(3)
+    pushed = iter(range(10))
+    popped = []
+    frames.push(next(pushed))
+    frames.push(next(pushed))
+    # the head goes around the buffer many times
+    for frame in pushed:
+        frames.push(frame)
+        popped.append(frames.pop())
+
+    assert popped == list(range(8))
+    assert frames.all() == [8, 9]
+    assert len(frames.buffer) == 3
+
+
+def test_ring_full_drops_the_push():
+    frames = RingFrameStorage(2)
+    frames.push("a")
+    frames.push("b")
+    frames.pop()
+    frames.push("c")
+    frames.push("d")
+
+    assert frames.count() == 2
+    assert frames.all() == ["b", "c"]
+
+
+def test_unbounded_ring_grows_in_order():
+    frames = RingFrameStorage()
+    frames.push(0)
+    frames.pop()
+    # the head is not at the start of the buffer when it grows
+    for frame in range(1, 10):
+        frames.push(frame)
+
+    assert frames.all() == list(range(1, 10))
+    assert [frames.pop() for _ in range(9)] == list(range(1, 10))
+    assert frames.pop() is None
+    assert frames.is_empty()
+
+
+def test_ring_clear_drops_the_frames():
+    frames = RingFrameStorage(3)
+    frames.push("a")
+    frames.push("b")
+    frames.pop()
+    frames.clear()
+
+    assert frames.is_empty()
+    assert frames.get() is None
+    assert frames.buffer == [None, None, None]
@@ -0,0 +1,137 @@
+from utils.interval import IntervalSet
+
+
+def windows(*spans):
+    # (key, start, end) with None for an open window
+    interval_set = IntervalSet()
+    for key, start, end in spans:
+        interval_set.add(key, start, f"frame {key}")
+        if end is not None:
+            interval_set.close(key, end)
+    return interval_set
+
+
+def test_add_and_get():
+    interval_set = windows((1, 10, None))
+
+    assert 1 in interval_set
+    assert len(interval_set) == 1
+    assert interval_set.get(1).item == "frame 1"
+    assert interval_set.get(1).end is None
+    assert interval_set.get(2) is None
+
+
+def test_close_and_cut():
+    interval_set = windows((1, 10, None), (2, 10, 50))
+
+    interval_set.close(1, 60)
+    assert interval_set.get(1).end == 60
+    # a cut only shortens the window
+    assert not interval_set.cut(2, 70)
+    assert interval_set.get(2).end == 50
+    assert interval_set.cut(2, 30)
+    assert interval_set.get(2).end == 30
+    assert not interval_set.cut(3, 30)
+
+
+def test_starting_and_covering():
+    interval_set = windows((1, 10, 30), (2, 20, None), (3, 30, 40))
+
+    assert interval_set.starting(20) == ["frame 2"]
+    assert interval_set.starting(25) == []
+    assert interval_set.covering(10) == ["frame 1"]
+    # the end is not covered
+    assert interval_set.covering(30) == ["frame 2", "frame 3"]
+    assert interval_set.covering(100) == ["frame 2"]
+
+
+def test_overlapping_until_the_time():
+    interval_set = windows((1, 10, 50), (2, 40, 60), (3, 50, 70), (4, 0, 10))
+
+    # touching windows do not overlap
+    assert interval_set.overlapping(1, 100) == ["frame 2"]
+    assert interval_set.overlapping(2, 100) == ["frame 1", "frame 3"]
+    # only the windows started until the time
+    assert interval_set.overlapping(2, 45) == ["frame 1"]
+    assert interval_set.overlapping(5, 100) == []
+
+
+def test_uncovered():
+    interval_set = windows((1, 10, 100), (2, 30, 50), (3, 40, 60), (4, 90, None))
+
+    # until the given time, and not after the end
+    assert interval_set.uncovered(1, 30) == 20
+    assert interval_set.uncovered(1, 45) == 20
+    # the overlapping spans are counted once
+    assert interval_set.uncovered(1, 80) == 40
+    assert interval_set.uncovered(1, 200) == 50
+    assert interval_set.uncovered(5, 200) == 0
+
+
+def test_uncovered_of_open_window():
+    interval_set = windows((1, 0, None), (2, 10, 20))
+
+    assert interval_set.uncovered(1, 50) == 40
+
+
+def test_prune_keeps_what_can_still_overlap():
+    interval_set = windows((1, 0, 20), (2, 10, 40), (3, 50, None))
+
+    # 1 ended, but 2 is live and overlaps it
+    interval_set.prune(30)
+    assert 1 in interval_set
+
+    interval_set.prune(45)
+    assert 1 not in interval_set and 2 not in interval_set
+    assert 3 in interval_set
+
+
+def test_prune_keeps_the_overlaps_of_the_kept_window():
+    interval_set = windows((1, 0, 20), (2, 10, 40), (3, 30, 60))
+
+    interval_set.prune(50, keep=2)
+    assert 1 in interval_set
+
+    interval_set.prune(50)
+    assert 1 not in interval_set
+    # still overlaps the live window 3
+    assert 2 in interval_set
+
+
+def test_reaching():
+    interval_set = windows((1, 0, 100), (2, 10, 30))
+
+    assert interval_set.reaching(1, 10) == 10
+    # heard from 0 to 10, then from 30
+    assert interval_set.reaching(1, 20) == 40
+    # the window ends first
+    assert interval_set.reaching(1, 200) is None
+    assert interval_set.reaching(3, 10) is None
+
+    interval_set.add(3, 50, "frame 3")
+    assert interval_set.reaching(1, 30) == 50
+    # the open window covers the rest
+    assert interval_set.reaching(1, 31) is None
+
+
+def test_next_idle():
+    interval_set = windows((1, 0, 100), (2, 90, 150), (3, 200, None))
+
+    assert interval_set.next_idle(50) == 150
+    assert interval_set.next_idle(160) == 160
+    assert interval_set.next_idle(210) is None
+
+
+def test_is_kept_like_prune():
+    interval_set = windows((1, 0, 20), (2, 30, 40), (3, 50, None))
+
+    assert not interval_set.is_kept(1, 60)
+    assert not interval_set.is_kept(2, 60)
+    assert interval_set.is_kept(3, 60)
+    assert interval_set.is_kept(2, 60, keep=2)
+    assert not interval_set.is_kept(1, 60, keep=2)
+
+    interval_set.prune(60, keep=2)
+    assert [key in interval_set for key in (1, 2, 3)] == [False, True, True]
+    assert interval_set.is_kept(2, 60, keep=2)
+    assert not interval_set.is_kept(1, 60, keep=2)
@@ -0,0 +1,51 @@
+from utils.rng import RandomStreams
+
+
+def draws(streams, purpose="backoff", index=0, count=5):
+    stream = streams.stream(purpose, index)
+    return [stream.random() for _ in range(count)]
+
+
+def test_same_seed_same_streams():
+    assert draws(RandomStreams(7)) == draws(RandomStreams(7))
+    assert draws(RandomStreams(7)) != draws(RandomStreams(8))
+
+
+def test_streams_of_purposes_and_stations_are_apart():
+    streams = RandomStreams(7)
+
+    assert draws(streams, "backoff", 0) != draws(streams, "backoff", 1)
+    assert draws(streams, "backoff", 0) != draws(streams, "receiver", 0)
+
+
+def test_spawned_replicas_are_apart():
+    streams = RandomStreams(7)
+    replicas = [streams.spawn(index) for index in range(3)]
+
+    all_draws = [draws(streams)] + [draws(replica) for replica in replicas]
+    assert len({tuple(d) for d in all_draws}) == len(all_draws)
+
+
+def test_spawn_only_depends_on_the_seed_and_the_index():
+    streams = RandomStreams(7)
+    # draws of the parent and of the other replicas do not move a replica
+    draws(streams)
+    draws(streams.spawn(0), count=100)
+
+    assert draws(streams.spawn(1)) == draws(RandomStreams(7).spawn(1))
+    assert draws(streams.spawn(1).spawn(2)) == draws(RandomStreams(7).spawn(1).spawn(2))
+    assert draws(streams.spawn(1).spawn(2)) != draws(streams.spawn(2).spawn(1))
+
+
+def test_spawn_without_seed_keeps_the_entropy():
+    streams = RandomStreams()
+
+    assert streams.spawn(0).entropy == streams.entropy
+    assert draws(streams.spawn(0)) == draws(streams.spawn(0))
+
+
+def test_generator_is_seeded_like_the_stream():
+    first = RandomStreams(7).spawn(1).generator("traffic", 3)
+    second = RandomStreams(7).spawn(1).generator("traffic", 3)
+
+    assert first.integers(0, 1 << 30, 5).tolist() == second.integers(0, 1 << 30, 5).tolist()
@@ -0,0 +1,9 @@
+import pytest
+
+from config import regression_seeds, regression_settings
+from main import check_stepping
+
+
+@pytest.mark.parametrize("settings", regression_settings)
+def test_modes_reproduce_fine_stepping(settings):
+    assert check_stepping([settings], regression_seeds[:1])
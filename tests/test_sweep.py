@@ -0,0 +1,71 @@
+import signal
+import time
+from typing import Dict, List
+
+import pytest
+
+from utils.sweep import Sweep, execute_run
+
+
+def simulated(settings: Dict) -> List[Dict]:
+    return [{"current": settings["value"]}]
+
+
+def sweep(run, retries: int = 0, timeout=None):
+    saved = []
+    reports = Sweep(run, saved.append, workers=1, timeout=timeout, retries=retries).execute(
+        [{"value": value} for value in (3, 1, 2)]
+    )
+    return reports, saved
+
+
+def test_reports_are_sorted_by_index():
+    reports, saved = sweep(simulated)
+
+    assert [report["index"] for report in reports] == [0, 1, 2]
+    assert [report["status"] for report in reports] == ["done"] * 3
+    assert [report["results"] for report in saved] == [[{"current": v}] for v in (3, 1, 2)]
+
+
+def test_failed_run_is_retried_then_saved():
+    failed = set()
+
+    def flaky(settings: Dict) -> List[Dict]:
+        if settings["value"] not in failed:
+            failed.add(settings["value"])
+            raise ValueError(settings["value"])
+        return simulated(settings)
+
+    reports, saved = sweep(flaky, retries=1)
+
+    assert [report["status"] for report in reports] == ["done"] * 3
+    assert [report["attempt"] for report in reports] == [2] * 3
+    assert len(saved) == 3
+
+
+def test_failed_run_without_retries_is_reported():
+    def failing(settings: Dict) -> List[Dict]:
+        if settings["value"] == 1:
+            raise ValueError("broken")
+        return simulated(settings)
+
+    reports, saved = sweep(failing)
+
+    assert [report["status"] for report in reports] == ["done", "failed", "done"]
+    assert reports[1]["error"] == repr(ValueError("broken"))
+    assert reports[1]["results"] is None
+    assert [report["index"] for report in saved] == [0, 2]
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGALRM"), reason="no alarm to interrupt the run")
+def test_runaway_run_times_out():
+    def runaway(settings: Dict) -> List[Dict]:
+        time.sleep(5)
+        return simulated(settings)
+
+    start = time.perf_counter()
+    report = execute_run({"index": 0, "settings": {"value": 1}, "attempt": 1}, runaway, 0.1)
+
+    assert report["status"] == "timeout"
+    assert report["results"] is None
+    assert time.perf_counter() - start < 2
@@ -0,0 +1,130 @@
+import pytest
+
+from core.time.wheel import TimerWheel
+
+STEP = 10
+
+
+def collect(wheel, fired, at):
+    return wheel.add(at, lambda: fired.append((at, wheel.now)))
+
+
+def advance_by_ticks(wheel, until):
+    # like the step engine, one tick at a time
+    while wheel.now < until:
+        wheel.advance(wheel.now + wheel.step)
+
+
+@pytest.mark.parametrize(
+    "at",
+    [
+        STEP,
+        63 * STEP,
+        64 * STEP,
+        # cascaded from the second and the third level
+        65 * STEP,
+        4096 * STEP,
+        4097 * STEP + 5,
+    ],
+)
+def test_fires_on_the_tick(at):
+    wheel = TimerWheel(STEP)
+    fired = []
+    collect(wheel, fired, at)
+
+    advance_by_ticks(wheel, at + STEP)
+
+    # a time between the ticks fires on the next one
+    assert fired == [(at, -(-at // STEP) * STEP)]
+    assert len(wheel) == 0
+
+
+def test_overflow_is_cascaded():
+    wheel = TimerWheel(1)
+    fired = []
+    at = (1 << (wheel.bits * wheel.levels)) + 3
+    collect(wheel, fired, at)
+    assert wheel.overflow
+
+    wheel.advance(at - 1)
+    assert fired == []
+    wheel.advance(at)
+    assert fired == [(at, at)]
+
+
+def test_fires_in_order_of_expiry_then_of_adding():
+    wheel = TimerWheel(STEP)
+    fired = []
+    for at in (300, 100, 300, 200):
+        wheel.add(at, lambda at=at: fired.append(at))
+
+    wheel.advance(1000)
+
+    assert fired == [100, 200, 300, 300]
+
+
+def test_far_advance_jumps():
+    wheel = TimerWheel(STEP)
+    fired = []
+    for at in (50, 700 * STEP, 9000 * STEP):
+        collect(wheel, fired, at)
+
+    wheel.advance(800 * STEP)
+
+    assert fired == [(50, 800 * STEP), (700 * STEP, 800 * STEP)]
+    assert wheel.next_expiry() == 9000 * STEP
+
+
+def test_expired_time_fires_on_the_next_tick():
+    wheel = TimerWheel(STEP)
+    wheel.advance(100)
+    fired = []
+    collect(wheel, fired, 40)
+
+    wheel.advance(110)
+
+    assert fired == [(40, 110)]
+
+
+def test_cancelled_timer_does_not_fire():
+    wheel = TimerWheel(STEP)
+    fired = []
+    timer = collect(wheel, fired, 100)
+    wheel.cancel(timer)
+    wheel.cancel(timer)
+
+    wheel.advance(200)
+
+    assert fired == []
+    assert len(wheel) == 0
+
+
+def test_next_expiry():
+    wheel = TimerWheel(STEP)
+    assert wheel.next_expiry() is None
+
+    late = wheel.add(5000 * STEP, lambda: None)
+    assert wheel.next_expiry() == 5000 * STEP
+    # earlier timers replace the cached one
+    middle = wheel.add(70 * STEP, lambda: None)
+    assert wheel.next_expiry() == 70 * STEP
+    early = wheel.add(3 * STEP, lambda: None)
+    assert wheel.next_expiry() == 3 * STEP
+
+    wheel.cancel(early)
+    assert wheel.next_expiry() == 70 * STEP
+    wheel.cancel(middle)
+    assert wheel.next_expiry() == 5000 * STEP
+    wheel.cancel(late)
+    assert wheel.next_expiry() is None
+
+
+def test_next_expiry_after_firing():
+    wheel = TimerWheel(STEP)
+    wheel.add(2 * STEP, lambda: None)
+    wheel.add(130 * STEP, lambda: None)
+    assert wheel.next_expiry() == 2 * STEP
+
+    advance_by_ticks(wheel, 2 * STEP)
+
+    assert wheel.next_expiry() == 130 * STEP
@@ -17,12 +17,13 @@ class AreaDrawer:
         self.instances = [n["instance"] for n in notation]
         self.notations = {n["instance"]: n["notation"] for n in notation}
 
-    def get_locations(self, participants) -> Dict[int, Dict]:
+    def get_locations(self, groups: Dict[str, Dict]) -> Dict[int, Dict]:
         objects = {}
         for instance in self.instances:
             if instance == self.default_instance:
                 continue
-            for participant in participants:
+            # only the group of the instance is searched
+            for participant in groups[instance.kind]:
                 if isinstance(participant, instance):
                     location = participant.location
                     if location is None:
@@ -35,8 +36,8 @@ class AreaDrawer:
                     )
         return objects
 
-    def draw_screen(self, participants):
-        objects = self.get_locations(participants)
+    def draw_screen(self, groups: Dict[str, Dict]):
+        objects = self.get_locations(groups)
         screen = ""
         for x in range(0, self.area_size):
             for y in range(0, self.area_size):
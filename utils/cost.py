@@ -0,0 +1,116 @@
+import csv
+import math
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def features(settings: Dict) -> List[float]:
+    return [
+        1.0,
+        math.log(max(settings["station_count"], 1)),
+        math.log(max(settings["frame_rate"], 1)),
+        1.0 if settings["with_rts"] else 0.0,
+        # every replica ticks its own stations
+        math.log(max(settings.get("replicas", 1), 1)),
+        # the engines which skip the ticks changing nothing
+        1.0 if settings.get("engine", "step") == "event" else 0.0,
+        1.0 if settings.get("fast_forward", False) else 0.0,
+    ]
+
+
+feature_count = len(features({"station_count": 1, "frame_rate": 1, "with_rts": False}))
+
+
+def ticks(settings: Dict) -> float:
+    return max(settings["max_time"] / settings["step"], 1)
+
+
+class CostModel:
+    """Predict the wall time of a run from its settings, to submit the longest runs first.
+
+    The wall time grows with the number of ticks,
+    and the log of the wall time for a tick is fitted linearly to the logs of the station count,
+    the frame rate and the replicas, whether RTS is used, and whether the engine skips ticks
+    (the event engine or fast_forward), with the times measured by the earlier runs.
+    Until there are enough of them, the ticks times the offered frames of the stations are used,
+    which assumes that every run of the sweep has the same engine.
+    """
+
+    def __init__(self, coefficients: Optional[np.ndarray] = None):
+        self.coefficients = coefficients
+
+    @classmethod
+    def fit(cls, samples: List[Dict]) -> "CostModel":
+        # twice as many samples as the coefficients, to not follow the noise of a few runs
+        if len(samples) < 2 * feature_count:
+            return cls()
+        x = np.array([features(sample) for sample in samples])
+        y = np.log([max(sample["wall_time"], 1e-6) / ticks(sample) for sample in samples])
+        # a feature which is the same in every sample, like the engine of a uniform sweep,
+        # is not told apart from the intercept, and the least squares of lstsq still predict the same
+        coefficients, *_ = np.linalg.lstsq(x, y, rcond=None)
+        return cls(coefficients)
+
+    @classmethod
+    def from_results(cls, directory: str = "results/csv") -> "CostModel":
+        return cls.fit(load_samples(directory))
+
+    def predict(self, settings: Dict) -> float:
+        if self.coefficients is None:
+            return (
+                ticks(settings)
+                * settings["station_count"]
+                * settings.get("replicas", 1)
+                * (1 + settings["frame_rate"] / 100)
+            )
+        return ticks(settings) * float(np.exp(np.dot(self.coefficients, features(settings))))
+
+
+def load_samples(directory: str) -> List[Dict]:
+    """Read the measured wall time of the saved runs, with the settings it depends on.
+
+    A run saves a row for each replica with the wall time of the whole run,
+    so only one sample is taken for a seed and a run of a file.
+    Rows saved without the engine or the replicas are taken as step engine runs without replicas.
+    """
+    samples = []
+    if not os.path.isdir(directory):
+        return samples
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".csv"):
+            continue
+        seen = set()
+        with open(os.path.join(directory, filename), newline="") as f:
+            for line, row in enumerate(csv.DictReader(f)):
+                # results saved before the times were measured
+                if not row.get("wall_time") or not row.get("step"):
+                    continue
+                if row.get("run") is None:
+                    # saved before the runs were told apart, every row is a run
+                    key = line
+                else:
+                    key = (row.get("seed"), row["run"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                samples.append(
+                    {
+                        "station_count": float(row["station_count"]),
+                        "frame_rate": float(row["frame_rate"]),
+                        "with_rts": row["with_rts"] == "True",
+                        "replicas": int(float(row.get("replicas") or 1)),
+                        "engine": row.get("engine") or "step",
+                        "fast_forward": row.get("fast_forward") == "True",
+                        "max_time": float(row["current"]),
+                        "step": float(row["step"]),
+                        "wall_time": float(row["wall_time"]),
+                    }
+                )
+    return samples
+
+
+def longest_first(settings_list: List[Dict], model: CostModel) -> List[Dict]:
+    # the long runs do not leave the other workers idle at the end
+    return sorted(settings_list, key=model.predict, reverse=True)
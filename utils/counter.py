@@ -1,18 +1,113 @@
+from typing import TYPE_CHECKING, Callable, Optional
+
+from constant import FRAME_TYPES
+
+if TYPE_CHECKING:
+    from core.time.wheel import Timer, TimerWheel
+
+
 class Counter:
-    value: int
+    """Counts down with the clock of the timer wheel while it runs, instead of being decreased every tick.
+
+    A running counter only keeps the value left when it started, and its expiry is a timer on the wheel,
+    which calls ``on_expire``, so the owner is woken instead of polling the counter.
+    A paused counter keeps the value left, and runs again from there.
+    A tick counts when the counter runs on it, the ticks after ``since`` while it is running.
+    """
 
-    def __init__(self, slot=1, value=0):
+    __slots__ = ("timers", "slot", "left", "since", "running", "timer", "on_expire")
+
+    def __init__(
+        self,
+        timers: "TimerWheel",
+        slot=1,
+        value=0,
+        on_expire: Optional[Callable[[], None]] = None,
+    ):
+        self.timers = timers
         self.slot = int(slot)
-        self.value = int(slot * value)
+        self.left = int(slot * value)
+        self.since = 0
+        self.running = False
+        self.timer: Optional["Timer"] = None
+        self.on_expire = on_expire
+
+    def remaining(self, at: int) -> int:
+        # left after the tick at the given time, if it counts
+        if not self.running:
+            return self.left
+        return max(self.left - max(at - self.since, 0), 0)
 
-    def increase(self, step=1):
-        self.value += step
+    @property
+    def value(self) -> int:
+        return self.remaining(self.timers.now)
 
-    def decrease(self, step=1):
-        self.value = max(self.value - step, 0)
+    def is_left(self) -> bool:
+        # a running counter never starts after the current tick
+        if not self.running:
+            return self.left > 0
+        return self.since + self.left > self.timers.now
 
     def reset(self, value=0):
-        self.value = int(self.slot * value)
+        self.pause(self.timers.now)
+        self.left = int(self.slot * value)
 
-    def is_left(self) -> bool:
-        return self.value > 0
+    def run(self, since: int):
+        """Count on every tick after the given time, until it is paused."""
+        if self.running:
+            return
+        self.since = since
+        self.running = True
+        # expiring on the current tick, which the owner is already on
+        if since + self.left > self.timers.now:
+            self.timer = self.timers.add(since + self.left, self.expire)
+
+    def pause(self, at: int):
+        """Stop counting, from the tick at the given time."""
+        if not self.running:
+            return
+        self.left = self.remaining(at - self.timers.step)
+        self.running = False
+        self.timers.cancel(self.timer)
+        self.timer = None
+
+    def expire(self):
+        self.timer = None
+        if self.on_expire is not None:
+            self.on_expire()
+
+
+class FrameCounter:
+    __slots__ = ("counts", "sizes", "airtimes", "total_count", "total_size")
+
+    index = {typ: i for i, typ in enumerate(FRAME_TYPES)}
+
+    def __init__(self):
+        self.counts = [0] * len(FRAME_TYPES)
+        self.sizes = [0] * len(FRAME_TYPES)
+        self.airtimes = [0.0] * len(FRAME_TYPES)
+        self.total_count = 0
+        self.total_size = 0
+
+    def add(self, typ: str, size: int, airtime: float):
+        i = self.index[typ]
+        self.counts[i] += 1
+        self.sizes[i] += size
+        self.airtimes[i] += airtime
+        self.total_count += 1
+        self.total_size += size
+
+    def count(self, typ: Optional[str] = None) -> int:
+        if typ is None:
+            return self.total_count
+        return self.counts[self.index[typ]]
+
+    def size(self, typ: Optional[str] = None) -> int:
+        if typ is None:
+            return self.total_size
+        return self.sizes[self.index[typ]]
+
+    def airtime(self, typ: Optional[str] = None) -> float:
+        if typ is None:
+            return sum(self.airtimes)
+        return self.airtimes[self.index[typ]]
@@ -0,0 +1,27 @@
+from typing import Dict, Generic, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+Cell = Tuple[int, int]
+
+
+class SpatialGrid(Generic[T]):
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, List[T]] = {}
+
+    def cell(self, location: Tuple[float, float]) -> Cell:
+        return (
+            int(location[0] // self.cell_size),
+            int(location[1] // self.cell_size),
+        )
+
+    def add(self, item: T, location: Tuple[float, float]):
+        self.cells.setdefault(self.cell(location), []).append(item)
+
+    def nearby(self, location: Tuple[float, float]) -> Iterator[T]:
+        # anything within cell_size lies in the surrounding 3x3 cells
+        x, y = self.cell(location)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                yield from self.cells.get((x + dx, y + dy), [])
@@ -1,6 +1,6 @@
 import os
-from random import randint
-from typing import Tuple
+import random
+from typing import Optional, Tuple
 import math
 
 
@@ -12,7 +12,10 @@ def get_distance(l1: Tuple[float, float], l2: Tuple[float, float]) -> float:
     return math.sqrt((l1[0] - l2[0]) ** 2 + (l1[1] - l2[1]) ** 2)
 
 
-def get_random_location(area_size: int, radius: int = None) -> Tuple[int, int]:
+def get_random_location(
+    area_size: int, radius: int = None, rng: Optional[random.Random] = None
+) -> Tuple[int, int]:
+    randint = rng.randint if rng is not None else random.randint
     l = (randint(0, area_size), randint(0, area_size))
     if radius is not None:
         center = (area_size // 2, area_size // 2)
@@ -0,0 +1,186 @@
+from typing import Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Window(Generic[T]):
+    __slots__ = ("start", "end", "item")
+
+    def __init__(self, start: int, item: T):
+        self.start = start
+        # open until the end is known
+        self.end: Optional[int] = None
+        self.item = item
+
+    def overlaps(self, other: "Window[T]") -> bool:
+        return (other.end is None or self.start < other.end) and (
+            self.end is None or other.start < self.end
+        )
+
+
+class IntervalSet(Generic[T]):
+    """Half-open [start, end) windows keyed by id, kept in the order they are added.
+
+    Ended windows are kept while they may still overlap a window which is queried,
+    so the overlaps of a window can be asked after the others are gone.
+    """
+
+    def __init__(self):
+        self.windows: Dict[int, Window[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self.windows)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.windows
+
+    def add(self, key: int, start: int, item: T):
+        self.windows[key] = Window(start, item)
+
+    def close(self, key: int, end: int):
+        window = self.windows.get(key)
+        if window is not None:
+            window.end = end
+
+    def cut(self, key: int, end: int) -> bool:
+        # True if the window is shortened
+        window = self.windows.get(key)
+        if window is not None and (window.end is None or end < window.end):
+            window.end = end
+            return True
+        return False
+
+    def get(self, key: int) -> Optional[Window[T]]:
+        return self.windows.get(key)
+
+    def starting(self, at: int) -> List[T]:
+        return [window.item for window in self.windows.values() if window.start == at]
+
+    def covering(self, at: int) -> List[T]:
+        return [
+            window.item
+            for window in self.windows.values()
+            if window.start <= at and (window.end is None or at < window.end)
+        ]
+
+    def overlapping(self, key: int, at: int) -> List[T]:
+        """Get the items of the other windows which overlap the window, and started until the time."""
+        window = self.windows.get(key)
+        if window is None:
+            return []
+        return [
+            other.item
+            for other_key, other in self.windows.items()
+            if other_key != key and other.start <= at and window.overlaps(other)
+        ]
+
+    def uncovered(self, key: int, until: int) -> int:
+        """Get the time of the window before the given time, which no other window covers."""
+        window = self.windows.get(key)
+        if window is None:
+            return 0
+        end = until if window.end is None else min(window.end, until)
+        if end <= window.start:
+            return 0
+        spans = sorted(
+            (
+                max(other.start, window.start),
+                end if other.end is None else min(other.end, end),
+            )
+            for other_key, other in self.windows.items()
+            if other_key != key and other.start < end and window.overlaps(other)
+        )
+        covered = 0
+        reached = window.start
+        for start, stop in spans:
+            start = max(start, reached)
+            if stop > start:
+                covered += stop - start
+                reached = stop
+        return end - window.start - covered
+
+    def reaching(self, key: int, amount: int) -> Optional[int]:
+        """Get the earliest time by which ``uncovered()`` of the window reaches the amount.
+
+        None if it never does with the windows known so far,
+        because the window ends first or an open window covers the rest of it.
+        """
+        window = self.windows.get(key)
+        if window is None:
+            return None
+        # open windows have no end to sort by
+        spans = sorted(
+            (
+                (max(other.start, window.start), other.end)
+                for other_key, other in self.windows.items()
+                if other_key != key and window.overlaps(other)
+            ),
+            key=lambda span: span[0],
+        )
+        heard = 0
+        reached = window.start
+        for start, stop in spans:
+            if start > reached:
+                if heard + start - reached >= amount:
+                    break
+                heard += start - reached
+            if stop is None:
+                return None
+            reached = max(reached, stop)
+        at = reached + amount - heard
+        if window.end is not None and at > window.end:
+            return None
+        return at
+
+    def next_idle(self, at: int) -> Optional[int]:
+        """Get the first time from the given one which no window covers, None if an open window covers it."""
+        idle = at
+        while True:
+            ends = [
+                window.end
+                for window in self.windows.values()
+                if window.start <= idle and (window.end is None or idle < window.end)
+            ]
+            if not ends:
+                return idle
+            if None in ends:
+                return None
+            idle = max(ends)
+
+    def next_start(self, at: int) -> Optional[int]:
+        starts = [window.start for window in self.windows.values() if window.start > at]
+        return min(starts) if starts else None
+
+    def horizon(self, at: int, keep: Optional[int] = None) -> Optional[int]:
+        # the windows which ended until the horizon can not overlap the live ones or the kept one,
+        # None if no window ended
+        horizon = at
+        ended = False
+        for key, window in self.windows.items():
+            if key == keep or window.end is None or window.end > at:
+                if window.start < horizon:
+                    horizon = window.start
+            else:
+                ended = True
+        return horizon if ended else None
+
+    def is_kept(self, key: int, at: int, keep: Optional[int] = None) -> bool:
+        """Check if the window is kept by ``prune()`` at the time, whether or not it was pruned since."""
+        window = self.windows.get(key)
+        if window is None:
+            return False
+        horizon = self.horizon(at, keep)
+        return horizon is None or window.end is None or window.end > horizon
+
+    def prune(self, at: int, keep: Optional[int] = None):
+        """Drop the windows which ended, and can not overlap the live ones or the kept one."""
+        horizon = self.horizon(at, keep)
+        if horizon is None:
+            return
+        expired = [
+            key
+            for key, window in self.windows.items()
+            if window.end is not None and window.end <= horizon
+        ]
+        for key in expired:
+            del self.windows[key]
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List
 from constant import KILLO, MILLI_SECOND, ONE_SECOND
 from core.implements import Station, Medium, Frame, medium
 from core.time.line import TimeLine
@@ -19,11 +19,25 @@ def frame_notate(frame: Frame):
     return frame.icon()
 
 
+def get_mediums(timeline: TimeLine) -> List[Medium]:
+    return list(timeline.group("medium"))
+
+
 def parse_result(timeline: TimeLine, settings: Dict):
-    mediums = [p for p in timeline.participants if isinstance(p, Medium)]
+    mediums = get_mediums(timeline)
     if len(mediums) != 1:
         raise ValueError("Only one medium is supported")
-    medium = mediums[0]
+    return parse_medium(timeline, mediums[0], settings), mediums[0]
+
+
+def parse_results(timeline: TimeLine, settings: Dict) -> List[Dict]:
+    return [
+        {**parse_medium(timeline, medium, settings), "replica": replica}
+        for replica, medium in enumerate(get_mediums(timeline))
+    ]
+
+
+def parse_medium(timeline: TimeLine, medium: Medium, settings: Dict) -> Dict:
     processed = 0
     collisions = 0
     sent = 0
@@ -31,13 +45,15 @@ def parse_result(timeline: TimeLine, settings: Dict):
     frame_rate = 0
     count = 0
     wasted = 0
+    lost = 0
+    captured = 0
     for station in medium.stations:
-        processed += sum(
-            [r["size"] for r in station.transmitter.recv if r["typ"] == "DATA"]
-        )
+        processed += station.transmitter.recv.size("DATA")
         collisions += station.transmitter.collisions
         wasted += station.transmitter.wasted
-        sent += sum([r["count"] for r in station.transmitter.sent])
+        lost += sum(station.transmitter.collided.values())
+        captured += station.transmitter.captured
+        sent += station.transmitter.sent.count()
         data_rate += station.data_rate
         frame_rate += station.frame_rate
 
@@ -52,36 +68,52 @@ def parse_result(timeline: TimeLine, settings: Dict):
     max_bps = processed_ideal * ONE_SECOND / (timeline.current * bps_unit)
     collision_rate = collisions / (sent if sent != 0 else 1)
 
-    return (
-        {
-            "current": timeline.current,
-            "bps": bps,
-            "max_bps": max_bps,
-            "collision_rate": collision_rate,
-            "wasted": wasted,
-            "frame_on_air": medium.frame_count(),
-            "collisions": collisions,
-            "sent": sent,
-            "processed": processed,
-            "processed_ideal": processed_ideal,
-            "data_rate": data_rate,
-            "frame_rate": frame_rate,
-            "station_count": settings["station_count"],
-            "backoff_min": settings["backoff_min"],
-            "star_topology": settings["star_topology"],
-            "with_rts": settings["with_rts"],
-        },
-        medium,
-    )
+    return {
+        "current": timeline.current,
+        "bps": bps,
+        "max_bps": max_bps,
+        "collision_rate": collision_rate,
+        "wasted": wasted,
+        "frame_on_air": medium.frame_count(),
+        "frame_pool": medium.frame_pool_size(),
+        "frame_pool_high_water": medium.frame_pool_high_water,
+        "collisions": collisions,
+        "lost": lost,
+        "captured": captured,
+        "sent": sent,
+        "processed": processed,
+        "processed_ideal": processed_ideal,
+        "data_rate": data_rate,
+        "frame_rate": frame_rate,
+        "station_count": settings["station_count"],
+        "step": timeline.step,
+        "backoff_min": settings["backoff_min"],
+        "star_topology": settings["star_topology"],
+        "with_rts": settings["with_rts"],
+    }
 
 
 def get_log(timeline: TimeLine, settings: Dict, verbose: bool):
-    result, medium = parse_result(timeline, settings)
+    mediums = get_mediums(timeline)
+    if len(mediums) == 1:
+        return get_medium_log(timeline, mediums[0], settings, verbose)
+    # every replica is logged apart, they do not share a station
+    msg = ""
+    for replica, medium in enumerate(mediums):
+        msg += f"[replica {replica}]\n"
+        msg += get_medium_log(timeline, medium, settings, verbose)
+    return msg
+
+
+def get_medium_log(timeline: TimeLine, medium: Medium, settings: Dict, verbose: bool):
+    result = parse_medium(timeline, medium, settings)
     bps = result["bps"]
     max_bps = result["max_bps"]
     collision_rate = result["collision_rate"]
     wasted = result["wasted"]
     frame_on_air = result["frame_on_air"]
+    frame_pool = result["frame_pool"]
+    frame_pool_high_water = result["frame_pool_high_water"]
     collisions = result["collisions"]
     sent = result["sent"]
 
@@ -94,6 +126,7 @@ def get_log(timeline: TimeLine, settings: Dict, verbose: bool):
     msg += f"{'[collision rate]':20}{get_progress_bar(collision_rate)} {collisions}/{sent}\n"
     if verbose:
         msg += f"{'[frames on air]':20} {frame_on_air}\n"
+        msg += f"{'[frame pool]':20} {frame_pool} (max {frame_pool_high_water})\n"
 
     msg += "\n"
     msg += f"[node details]\n"
@@ -104,8 +137,8 @@ def get_log(timeline: TimeLine, settings: Dict, verbose: bool):
     msg += "\n"
     for station in medium.stations:
         msg += f"[{station.id:2}] | "
-        msg += f"{sum([r['count'] for r in station.transmitter.sent]):-3} | "
-        msg += f"{sum([r['count'] for r in station.transmitter.recv]):-3} | "
+        msg += f"{station.transmitter.sent.count():-3} | "
+        msg += f"{station.transmitter.recv.count():-3} | "
         msg += f"{station.transmitter.collisions:-3} | "
 
         if verbose:
@@ -141,10 +174,11 @@ def get_log(timeline: TimeLine, settings: Dict, verbose: bool):
             msg += f"{receiving.ljust(30, ' ')} | "
 
             detected = ""
-            if station.transmitter.detected_frames.get():
-                if station.transmitter.detected_frames.count() > 1:
+            heard = station.transmitter.windows.covering(timeline.current)
+            if heard:
+                if len(heard) > 1:
                     detected += "*"
-                detected += str(station.transmitter.detected_frames.get())
+                detected += str(heard[0])
             msg += f"{detected.rjust(12, ' ')} | "
 
             msg += f"{(station.transmitter.csma.backoff_range-1):-8} | "
@@ -192,19 +226,62 @@ def summary_settings(settings: Dict):
 
 
 def log_result(timeline: TimeLine, settings: Dict):
+    save_results(parse_results(timeline, settings), settings)
+
+
+def save_results(results: List[Dict], settings: Dict):
     import pandas as pd
 
-    result, _ = parse_result(timeline, settings)
     summary = summary_settings(settings)
 
     # msg = get_log(timeline, settings, False)
     # with open(f"results/log/{summary}.txt", "w") as f:
     #     f.write(msg)
 
-    df = pd.DataFrame.from_dict([result])
+    df = pd.DataFrame.from_dict(results)
     filename = f"results/csv/{summary}.csv"
     try:
         df = pd.concat([pd.read_csv(filename), df])
     except FileNotFoundError:
         pass
+    # the runs of a sweep finish in any order
+    order = [column for column in ("seed", "run", "replica") if column in df]
+    if order:
+        df = df.sort_values(order, kind="stable")
     df.to_csv(f"results/csv/{summary}.csv", index=False)
+
+
+def saved_runs(settings: Dict) -> int:
+    # every run saves a row for each replica
+    try:
+        with open(f"results/csv/{summary_settings(settings)}.csv") as f:
+            rows = sum(1 for _ in f) - 1
+    except FileNotFoundError:
+        return 0
+    return max(rows, 0) // settings["replicas"]
+
+
+def get_sweep_log(reports: List[Dict]) -> str:
+    done = [report for report in reports if report["status"] == "done"]
+    failed = [report for report in reports if report["status"] != "done"]
+    wall_time = sum(report["wall_time"] for report in reports)
+
+    msg = f"{'[runs]':20}{len(done)}/{len(reports)} done\n"
+    msg += f"{'[wall time]':20}{wall_time:.2f}s over every run\n"
+    if done:
+        speed = sum(report["us_per_second"] for report in done) / len(done)
+        msg += f"{'[speed]':20}{speed:.0f} simulated us/s on average\n"
+
+    msg += "\n"
+    msg += f"{'run'.rjust(4)} | {'settings'.ljust(32)} | {'status'.ljust(8)} | {'try'.rjust(3)} | {'wall'.rjust(8)} | {'us/s'.rjust(10)}\n"
+    for report in reports:
+        msg += f"{report['index']:-4} | "
+        msg += f"{summary_settings(report['settings']).ljust(32)} | "
+        msg += f"{report['status'].ljust(8)} | "
+        msg += f"{report['attempt']:-3} | "
+        msg += f"{report['wall_time']:-7.2f}s | "
+        msg += f"{report['us_per_second']:-10.0f}\n"
+
+    for report in failed:
+        msg += f"\n[{report['index']}] {report['status']}: {report['error']}"
+    return msg
@@ -0,0 +1,46 @@
+import random
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class RandomStreams:
+    """Independent random streams split from a master seed, one for each purpose and station.
+
+    A stream only depends on the seed, the purpose and the index,
+    so two settings with the same seed share the traffic and the placement of the stations
+    even when they draw a different number of backoffs.
+    Without a seed, the master entropy is drawn from the OS once.
+    """
+
+    purposes = ("traffic", "backoff", "placement", "receiver")
+
+    def __init__(self, seed: Optional[int] = None, key: Tuple[int, ...] = ()):
+        self.entropy = np.random.SeedSequence(seed).entropy
+        self.key = key
+        self.streams: Dict[Tuple[str, int], random.Random] = {}
+
+    def spawn(self, index: int) -> "RandomStreams":
+        # the streams of a replica, apart from the other replicas
+        child = RandomStreams(key=self.key + (index,))
+        child.entropy = self.entropy
+        return child
+
+    def seed_sequence(self, purpose: str, index: int) -> np.random.SeedSequence:
+        return np.random.SeedSequence(
+            self.entropy,
+            spawn_key=self.key + (self.purposes.index(purpose), index),
+        )
+
+    def generator(self, purpose: str, index: int = 0) -> np.random.Generator:
+        # for the draws made in batches
+        return np.random.default_rng(self.seed_sequence(purpose, index))
+
+    def stream(self, purpose: str, index: int = 0) -> random.Random:
+        key = (purpose, index)
+        stream = self.streams.get(key)
+        if stream is None:
+            state = self.seed_sequence(purpose, index).generate_state(2)
+            stream = random.Random(int(state[0]) << 32 | int(state[1]))
+            self.streams[key] = stream
+        return stream
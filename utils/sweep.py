@@ -0,0 +1,167 @@
+import os
+import signal
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional
+
+from tqdm import tqdm
+
+
+class RunTimeout(Exception):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise RunTimeout()
+
+
+def execute_run(
+    task: Dict, run: Callable[[Dict], List[Dict]], timeout: Optional[float]
+) -> Dict:
+    # the alarm interrupts a runaway run in the process which executes it
+    alarm = timeout is not None and hasattr(signal, "SIGALRM")
+    if alarm:
+        signal.signal(signal.SIGALRM, raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    start = time.perf_counter()
+    results = None
+    error = None
+    try:
+        results = run(task["settings"])
+        status = "done"
+    except RunTimeout:
+        status = "timeout"
+        error = f"over {timeout}s"
+    except Exception as e:
+        status = "failed"
+        error = repr(e)
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    wall_time = time.perf_counter() - start
+
+    simulated = results[0]["current"] if results else 0
+    return {
+        **task,
+        "status": status,
+        "error": error,
+        "results": results,
+        "wall_time": wall_time,
+        "us_per_second": simulated / wall_time if wall_time > 0 else 0.0,
+    }
+
+
+def execute_chunk(
+    tasks: List[Dict], run: Callable[[Dict], List[Dict]], timeout: Optional[float]
+) -> List[Dict]:
+    return [execute_run(task, run, timeout) for task in tasks]
+
+
+def lost_run(task: Dict, error: Exception) -> Dict:
+    # the worker died before it reported the run, it is failed like a raising one
+    return {
+        **task,
+        "status": "failed",
+        "error": repr(error),
+        "results": None,
+        "wall_time": 0.0,
+        "us_per_second": 0.0,
+    }
+
+
+class Sweep:
+    """Run every settings once in a pool of worker processes, and retry the failed runs.
+
+    ``run`` simulates the settings and returns the parsed results,
+    ``save`` is called in this process with the report of every finished run.
+    ``initializer`` is called once in every worker, which is kept for the whole sweep.
+    A worker which is killed fails the runs it has not reported, and the pool is made again for the retries.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Dict], List[Dict]],
+        save: Callable[[Dict], None],
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        initializer: Optional[Callable[[], None]] = None,
+    ):
+        self.run = run
+        self.save = save
+        self.initializer = initializer
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.timeout = timeout
+        self.retries = retries
+        # a worker was killed in the last round, and the pool cannot take runs anymore
+        self.broken = False
+
+    def pool(self, size: int) -> Optional[ProcessPoolExecutor]:
+        if self.workers == 1:
+            # the runs are made in this process
+            if self.initializer is not None:
+                self.initializer()
+            return None
+        return ProcessPoolExecutor(min(self.workers, size), initializer=self.initializer)
+
+    def map(self, pool: Optional[ProcessPoolExecutor], tasks: List[Dict]) -> Iterator[Dict]:
+        if pool is None:
+            yield from map(partial(execute_run, run=self.run, timeout=self.timeout), tasks)
+            return
+
+        chunks: Dict[Future, List[Dict]] = {}
+        for start in range(0, len(tasks), self.chunksize):
+            chunk = tasks[start : start + self.chunksize]
+            chunks[pool.submit(execute_chunk, chunk, self.run, self.timeout)] = chunk
+        for future in as_completed(chunks):
+            try:
+                yield from future.result()
+            except BrokenProcessPool as e:
+                # a killed worker breaks the pool, and every run not reported yet is lost
+                self.broken = True
+                for task in chunks[future]:
+                    yield lost_run(task, e)
+
+    def execute(self, settings_list: List[Dict]) -> List[Dict]:
+        tasks = [
+            {"index": index, "settings": settings, "attempt": 1}
+            for index, settings in enumerate(settings_list)
+        ]
+        reports = []
+        if not tasks:
+            return reports
+
+        # the workers are kept until every retry is done, unless one of them is killed
+        pool = self.pool(len(tasks))
+        try:
+            with tqdm(total=len(tasks)) as progress:
+                while tasks:
+                    self.broken = False
+                    retry = []
+                    for report in self.map(pool, tasks):
+                        if report["status"] != "done" and report["attempt"] <= self.retries:
+                            retry.append(
+                                {
+                                    "index": report["index"],
+                                    "settings": report["settings"],
+                                    "attempt": report["attempt"] + 1,
+                                }
+                            )
+                            continue
+                        if report["status"] == "done":
+                            self.save(report)
+                        reports.append(report)
+                        progress.update()
+                    tasks = retry
+                    if self.broken and tasks:
+                        pool.shutdown()
+                        pool = self.pool(len(tasks))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return sorted(reports, key=lambda report: report["index"])